@@ -0,0 +1,105 @@
+"""Pre-scales UI images for the configured screen so the app never resamples them at startup.
+
+``python asset_pipeline.py`` writes every size listed in config.ASSET_VARIANTS
+to config.ASSET_BUILD_DIR, together with a manifest.json that maps each source
+image and size to its variant. load_asset picks the exact-size variant and only
+resizes at runtime when there is none, or when the source changed after the build.
+"""
+import hashlib
+import json
+import logging
+import os
+
+from PIL import Image
+
+import config
+
+MANIFEST_NAME = "manifest.json"
+
+_manifest = None
+
+
+def _size_key(size):
+    return f"{size[0]}x{size[1]}"
+
+
+def _source_stamp(source_path):
+    # A content hash rather than mtime, so copying or unzipping the app keeps the variants valid
+    with open(source_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_assets(asset_variants=None, assets_dir=None, build_dir=None):
+    """Writes the pre-scaled variants and the manifest. Returns the number of variants written."""
+    asset_variants = asset_variants or config.ASSET_VARIANTS
+    assets_dir = assets_dir or config.ASSETS_DIR
+    build_dir = build_dir or config.ASSET_BUILD_DIR
+    os.makedirs(build_dir, exist_ok=True)
+
+    manifest = {}
+    for name, sizes in asset_variants.items():
+        source_path = os.path.join(assets_dir, name)
+        stem = os.path.splitext(name)[0]
+        variants = {}
+        with Image.open(source_path) as source:
+            source.load()
+            for size in sizes:
+                variant_name = f"{stem}_{_size_key(size)}.png"
+                source.resize(tuple(size), Image.Resampling.LANCZOS).save(
+                    os.path.join(build_dir, variant_name), format="PNG", optimize=True
+                )
+                variants[_size_key(size)] = variant_name
+        manifest[name] = {"source": _source_stamp(source_path), "variants": variants}
+
+    with open(os.path.join(build_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    global _manifest
+    _manifest = None  # Reload on next use
+    return sum(len(entry["variants"]) for entry in manifest.values())
+
+
+def _load_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(os.path.join(config.ASSET_BUILD_DIR, MANIFEST_NAME), encoding="utf-8") as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            _manifest = {}
+        except (OSError, ValueError) as e:
+            logging.error(f"Unreadable asset manifest, resizing assets at runtime: {e}")
+            _manifest = {}
+    return _manifest
+
+
+def variant_path(source_path, size):
+    """Returns the pre-scaled variant of ``source_path`` at ``size``, or None if the build has none."""
+    name = os.path.relpath(source_path, config.ASSETS_DIR).replace(os.sep, "/")
+    entry = _load_manifest().get(name)
+    if not entry or _size_key(size) not in entry["variants"]:
+        return None
+    try:
+        if _source_stamp(source_path) != entry["source"]:
+            return None  # Source edited after the build
+    except OSError:
+        pass  # Only the built variant is shipped
+    path = os.path.join(config.ASSET_BUILD_DIR, entry["variants"][_size_key(size)])
+    return path if os.path.exists(path) else None
+
+
+def load_asset(source_path, size):
+    """Returns ``source_path`` as a PIL image of ``size``, from its pre-scaled variant when there is one."""
+    path = variant_path(source_path, size)
+    if path is None:
+        logging.info(f"No pre-scaled {_size_key(size)} variant of {source_path}, resizing at runtime")
+        path = source_path
+    with Image.open(path) as image:
+        image.load()
+        if image.size != tuple(size):
+            return image.resize(tuple(size), Image.Resampling.LANCZOS)
+        return image
+
+
+if __name__ == "__main__":
+    count = build_assets()
+    print(f"Wrote {count} pre-scaled assets and {MANIFEST_NAME} to {config.ASSET_BUILD_DIR}")
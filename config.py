@@ -8,15 +8,88 @@ RESIZABLE_WIDTH = True
 RESIZABLE_HEIGHT = True
 FULLSCREEN = False
 
+# --- UI Assets ---
+ASSETS_DIR = "assets"
+ASSET_BUILD_DIR = os.path.join(ASSETS_DIR, "build")  # Output of asset_pipeline.py; not committed
+LOGO_SIZE = (SCREEN_WIDTH - 40, (SCREEN_WIDTH - 40) * 2 // 5)  # 200x80 on the 240x320 screen
+# Pre-scaled variants written by asset_pipeline.py: asset file -> sizes
+ASSET_VARIANTS = {
+    "pokedex_logo.png": [LOGO_SIZE],
+}
+
 # --- Default Theme ---
 DEFAULT_THEME = "breeze"  # black or plastik or equilux or breeze
 
 # --- Database ---
 DATABASE_FILE = os.path.join("data", "pokedex.db")
+DB_WRITE_BATCH_SIZE = 100  # Rows written per transaction by the bulk insert methods
+
+# --- SQLite Performance Profiles ---
+# PRAGMAs applied to every connection. "ingest" is for bulk loads (populate/sync/dump import),
+# "kiosk" for the read-mostly UI on SD-card storage. cache_size is in KiB when negative.
+SQLITE_PROFILES = {
+    "ingest": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # With WAL only checkpoints fsync, not every commit
+        "cache_size": -65536,  # 64 MiB
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 10000,  # Pages; fewer, larger checkpoints during bulk writes
+    },
+    "kiosk": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -8192,  # 8 MiB
+        "mmap_size": 64 * 1024 * 1024,  # Reads are served from the page cache without copying
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+    },
+}
+SQLITE_PROFILE = "kiosk"
+SQLITE_OPTIMIZE_ON_CLOSE = True  # Run PRAGMA optimize before closing the connection
 
 # --- API ---
 POKEAPI_BASE_URL = "https://pokeapi.co/api/v2/"
 
+# --- Ingestion ---
+INGEST_WORKERS = 4  # Number of threads fetching Pokémon documents in parallel
+
+# --- API Rate Limiting ---
+# Shared token bucket for all PokeAPI requests; the rate adapts to 429 / Retry-After responses
+API_RATE_LIMIT = 10.0  # Starting requests per second
+API_RATE_LIMIT_MIN = 0.5
+API_RATE_LIMIT_MAX = 50.0
+API_RATE_BURST = 10  # Requests that may be sent back-to-back after an idle period
+
+# --- HTTP Cache ---
+HTTP_CACHE_DIR = os.path.join("data", "http_cache")
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used responses are evicted above this size
+# "revalidate": serve cached responses after a conditional request (ETag / Last-Modified)
+# "replay": serve only from the cache and never touch the network (offline, deterministic runs)
+# "off": no caching
+HTTP_CACHE_MODE = "revalidate"
+
+# --- Sprites ---
+SPRITE_DIR = os.path.join("data", "sprites")  # <variant>/<pokemon id>.png, already resized to SPRITE_SIZE
+SPRITE_SIZE = (100, 100)
+# List icons packed into one memory-mapped file (see sprite_atlas.py); rebuilt after sprite downloads
+SPRITE_ATLAS_FILE = os.path.join("data", "sprites", "atlas.bin")
+SPRITE_ICON_SIZE = (24, 24)
+
+# --- Image Cache ---
+# Decoded images and Tk photo images shared by the views, budgeted separately; a 100x100 RGBA sprite
+# is 40 KB in each form. Decoded images are also filled by worker threads, photo images only by the Tk thread.
+IMAGE_CACHE_BYTES = 16 * 1024 * 1024
+PHOTO_CACHE_BYTES = 16 * 1024 * 1024
+
+# --- Prefetching ---
+PREFETCH_RADIUS = 3  # List entries on each side of the selection whose records and sprites are warmed
+PREFETCH_QUEUE_SIZE = 16
+PREFETCH_DOWNLOAD_SPRITES = False  # Only warm sprites already in the sprite store; no network while scrolling
+
+# --- Record Cache ---
+RECORD_CACHE_SIZE = 512  # Pokémon, berry and evolution family records kept in memory by PokemonDataManager
+
 # --- Font ---
 FONT_NAME = "Pokemon_Classic.ttf"
 FONT_PATH = os.path.join("assets", FONT_NAME)
@@ -0,0 +1,95 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionManager:
+    """Hands out SQLite connections that are safe to use from several threads.
+
+    Every thread gets its own read-only connection (opened with ``mode=ro``),
+    so reads never share a connection and, under WAL, never wait for the
+    writer. All writes go through a single writer connection that is
+    serialized by a lock. ``on_connect(conn, read_only)`` is called for every
+    new connection, e.g. to apply PRAGMAs.
+    """
+
+    def __init__(self, db_file, on_connect=None, timeout=5.0):
+        self.db_file = db_file
+        self.on_connect = on_connect
+        self.timeout = timeout
+        self._local = threading.local()
+        self._readers = {}  # thread id -> read-only connection
+        self._readers_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._closed = False
+
+    def _connect(self, read_only):
+        if read_only:
+            conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True,
+                                   timeout=self.timeout, check_same_thread=False)
+        else:
+            # Shared across threads, but only ever used under _write_lock
+            conn = sqlite3.connect(self.db_file, timeout=self.timeout, check_same_thread=False)
+        if self.on_connect:
+            self.on_connect(conn, read_only)
+        return conn
+
+    def _check_open(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager is closed")
+
+    def reader(self):
+        """Returns the calling thread's read-only connection, opening it on first use."""
+        self._check_open()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect(read_only=True)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers[threading.get_ident()] = conn
+        return conn
+
+    def release_reader(self):
+        """Closes the calling thread's read-only connection; worker threads call this before exiting."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._readers_lock:
+            self._readers.pop(threading.get_ident(), None)
+        conn.close()
+
+    def writer_connection(self):
+        """Returns the writer connection, opening it on first use. Only use it while holding writer()."""
+        self._check_open()
+        if self._writer is None:
+            self._writer = self._connect(read_only=False)
+        return self._writer
+
+    @contextmanager
+    def writer(self):
+        """Yields the writer connection inside one transaction, holding the write lock.
+
+        The transaction is committed when the block exits, or rolled back if it raises.
+        """
+        with self._write_lock:
+            conn = self.writer_connection()
+            with conn:
+                yield conn
+
+    def close(self):
+        """Closes every reader connection and the writer connection."""
+        with self._write_lock:
+            self._closed = True
+            with self._readers_lock:
+                readers, self._readers = list(self._readers.values()), {}
+            for conn in readers:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logging.error(f"Error closing reader connection: {e}")
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
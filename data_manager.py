@@ -4,33 +4,161 @@ import time
 import logging
 import config
 import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from connection_manager import ConnectionManager
+from http_cache import CachingAdapter, ResponseCache
+from image_cache import images
+from lru_cache import LRUCache
+from rate_limiter import AdaptiveRateLimiter, RateLimitedAdapter
+from sprite_atlas import SpriteAtlas, build_sprite_atlas
+from sprite_store import SpriteStore
 
 # Set up logging
 logging.basicConfig(filename='pokedex.log', level=logging.DEBUG,
                     format='%(asctime)s - %(levelname)s - %(filename)s - %(lineno)d - %(message)s')
 
-# Define a custom retry strategy for requests
+# Define a custom retry strategy for requests (429s are handled by the rate limiter below).
+# urllib3 would otherwise still retry any 429 that carries Retry-After, sleeping on the calling
+# thread, so the limiter would never see it; the limiter reads Retry-After itself.
 retries = Retry(
     total=5,
-    status_forcelist=[429, 500, 502, 503, 504],
+    status_forcelist=[500, 502, 503, 504],
     backoff_factor=0.3,
-    respect_retry_after_header=True,
+    respect_retry_after_header=False,
+)
+
+# One token bucket shared by every request on the session, across all ingestion threads
+rate_limiter = AdaptiveRateLimiter(
+    rate=config.API_RATE_LIMIT,
+    burst=config.API_RATE_BURST,
+    min_rate=config.API_RATE_LIMIT_MIN,
+    max_rate=config.API_RATE_LIMIT_MAX,
+)
+
+
+class PokeAPIAdapter(CachingAdapter, RateLimitedAdapter):
+    """Answers from the response cache first; requests that reach the network go through the rate limiter."""
+
+
+# PokeAPI responses are cached on disk and revalidated (or replayed offline, see config.HTTP_CACHE_MODE)
+response_cache = ResponseCache(config.HTTP_CACHE_DIR, config.HTTP_CACHE_MAX_BYTES)
+# Size the connection pool so every ingestion worker can keep a connection alive
+adapter = PokeAPIAdapter(
+    response_cache,
+    mode=config.HTTP_CACHE_MODE,
+    limiter=rate_limiter,
+    max_retries=retries,
+    pool_maxsize=max(10, config.INGEST_WORKERS),
 )
-adapter = HTTPAdapter(max_retries=retries)
 http = requests.Session()
 http.mount("https://", adapter)
 http.mount("http://", adapter)
 
+# Sprite PNGs are served by raw.githubusercontent.com, not the PokeAPI, so they get their own session:
+# retries (including 429s) but no PokeAPI rate limiter, and no response cache since the sprite store
+# already keeps them on disk
+sprite_adapter = HTTPAdapter(
+    max_retries=Retry(
+        total=5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        backoff_factor=0.3,
+        respect_retry_after_header=True,
+    ),
+    pool_maxsize=max(10, config.INGEST_WORKERS),
+)
+sprite_http = requests.Session()
+sprite_http.mount("https://", sprite_adapter)
+sprite_http.mount("http://", sprite_adapter)
+
+
+# Lightweight row for list screens: only the columns they display, without the description
+# and sprite URLs. Full records come from get_pokemon_by_id.
+PokemonListRow = namedtuple("PokemonListRow", ["id", "name", "type1", "type2", "is_favorite"])
+LIST_COLUMNS = ", ".join(PokemonListRow._fields)
+
+# One member of an evolution family from get_evolution_family. stage is 1 for the base form;
+# parent_id, trigger, level and item describe how this member evolves from its parent.
+EvolutionFamilyMember = namedtuple(
+    "EvolutionFamilyMember", ["pokemon_id", "name", "stage", "parent_id", "trigger", "level", "item"]
+)
+
+# A page of Pokémon from get_pokemon_page. next_cursor / prev_cursor are the ids to pass as
+# after_id / before_id for the following / preceding page, or None at either end of the list.
+PokemonPage = namedtuple("PokemonPage", ["rows", "next_cursor", "prev_cursor"])
+
+# Base-stat columns that the "stats" filter can range over, and the short names the query syntax accepts
+STAT_COLUMNS = ("hp", "attack", "defense", "sp_atk", "sp_def", "speed")
+STAT_ALIASES = {"atk": "attack", "def": "defense", "spatk": "sp_atk", "spdef": "sp_def", "spe": "speed"}
+FILTER_TOKEN = re.compile(r"^(type|\w+?)(:|>=|<=|>|<|=)(\w+)$")
+
+
+def parse_filter_query(text):
+    """Parses a search bar query into a get_pokemon_page filters dict.
+
+    ``type:<name>`` requires a type (in either slot) and ``<stat><op><value>``
+    (op one of >=, <=, >, <, =; stat a column of STAT_COLUMNS or a short name
+    from STAT_ALIASES) bounds a base stat. Every other word is free-text search,
+    e.g. "type:fire speed>=100 char".
+    """
+    filters = {"types": [], "stats": {}}
+    words = []
+    for token in text.lower().split():
+        match = FILTER_TOKEN.match(token)
+        if match and match.group(1) == "type" and match.group(2) == ":":
+            filters["types"].append(match.group(3))
+            continue
+        stat = match and STAT_ALIASES.get(match.group(1), match.group(1))
+        if stat in STAT_COLUMNS and match.group(2) != ":" and match.group(3).isdigit():
+            low, high = filters["stats"].get(stat, (None, None))
+            op, value = match.group(2), int(match.group(3))
+            if op in (">=", ">", "="):
+                low = max(low or 0, value + 1 if op == ">" else value)
+            if op in ("<=", "<", "="):
+                high = min(high if high is not None else value, value - 1 if op == "<" else value)
+            filters["stats"][stat] = (low, high)
+            continue
+        words.append(token)
+    if words:
+        filters["search"] = " ".join(words)
+    return {key: value for key, value in filters.items() if value}
+
+
+SQLITE_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "wal_autocheckpoint")
+# The subset that applies to read-only connections; the others are database-wide or only affect writes
+SQLITE_READER_PRAGMAS = ("cache_size", "mmap_size", "temp_store")
+
 
 class PokemonDataManager:
-    def __init__(self):
+    def __init__(self, profile=None):
+        # Named SQLite performance profile from config.SQLITE_PROFILES
+        self.profile = profile or config.SQLITE_PROFILE
+
+        # Evolution chain URL per Pokémon, taken from species documents fetched during ingestion;
+        # None for a Pokémon known to have no chain
+        self._evolution_chain_urls = {}
+        # Parsed evolution chains (edges, member ids) keyed by chain URL
+        self._evolution_chains = {}
+        # Read-through cache for get_pokemon_by_id, get_berry_by_id and get_evolution_family,
+        # keyed by ("pokemon" | "berry" | "family", id). Writes invalidate the entries they change.
+        self.record_cache = LRUCache(config.RECORD_CACHE_SIZE)
+        # Pre-resized sprites on local disk, downloaded through the sprite session
+        self.sprite_store = SpriteStore(config.SPRITE_DIR, config.SPRITE_SIZE, session=sprite_http)
+        # Memory-mapped list icons, opened on first use (False once found missing)
+        self._sprite_atlas = None
+
         self.create_database_file()
-        self.conn = self.create_connection(config.DATABASE_FILE)
+        self.connections = self.create_connection(config.DATABASE_FILE)
         self.create_pokemon_table()
+        self.fts_enabled = self.create_pokemon_search_index()
         self.create_berries_table()
         self.create_evolutions_table()
+        self.create_evolution_families_table()
+        self.create_sync_state_table()
 
     def create_database_file(self):
         """Creates the database file if it doesn't exist."""
@@ -43,15 +171,37 @@ class PokemonDataManager:
             logging.error(f"Error creating database file: {e}")
 
     def create_connection(self, db_file):
-        """Creates a database connection to the SQLite database."""
+        """Creates the ConnectionManager for the SQLite database.
+
+        Reads use a read-only connection per thread (``self.connections.reader()``);
+        writes go through the single writer connection (``self.connections.writer()``).
+        The writer is opened here so the profile's journal mode is set before any reader connects.
+        """
         try:
-            conn = sqlite3.connect(db_file)
-            logging.info(f"Connected to database: {db_file} (SQLite {sqlite3.version})")
-            return conn
+            connections = ConnectionManager(
+                db_file, on_connect=lambda conn, read_only: self.apply_profile(conn, self.profile, read_only)
+            )
+            connections.writer_connection()
+            logging.info(f"Connected to database: {db_file} (SQLite {sqlite3.version}, profile {self.profile})")
+            return connections
         except sqlite3.Error as e:
             logging.error(f"Error connecting to database: {e}")
             return None
 
+    def apply_profile(self, conn, profile, read_only=False):
+        """Applies the PRAGMAs of a named performance profile from config.SQLITE_PROFILES.
+
+        Read-only connections only get the per-connection PRAGMAs in SQLITE_READER_PRAGMAS.
+        """
+        if profile not in config.SQLITE_PROFILES:
+            raise ValueError(f"Unknown SQLite profile: {profile}")
+        for pragma, value in config.SQLITE_PROFILES[profile].items():
+            if pragma not in SQLITE_PRAGMAS:
+                raise ValueError(f"Unsupported PRAGMA in SQLite profile {profile}: {pragma}")
+            if read_only and pragma not in SQLITE_READER_PRAGMAS:
+                continue
+            conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+
     def create_pokemon_table(self):
         """Creates the pokemon table in the database if it doesn't exist."""
         sql_create_pokemon_table = """
@@ -73,65 +223,132 @@ class PokemonDataManager:
         );
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(sql_create_pokemon_table)
+            with self.connections.writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql_create_pokemon_table)
+                # Partial indexes over favourites only: they stay as small as the favourites list
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_pokemon_favorites ON pokemon (id) WHERE is_favorite = 1")
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_pokemon_favorites_name ON pokemon (name) WHERE is_favorite = 1"
+                )
+                # Type and base-stat filters: one index per column, with id so matches come out in list order
+                for column in ("type1", "type2") + STAT_COLUMNS:
+                    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_pokemon_{column} ON pokemon ({column}, id)")
             logging.info("Pokemon table created or already exists.")
         except sqlite3.Error as e:
             logging.error(f"Error creating pokemon table: {e}")
 
-    def fetch_pokemon_data(self, pokemon_url):
-        """Fetches pokemon data from the PokeAPI, including sprites."""
+    def create_pokemon_search_index(self):
+        """Creates the pokemon_fts full-text index and the triggers that keep it in sync.
+
+        Returns False if this SQLite build has no FTS5, in which case searches
+        fall back to LIKE.
+        """
+        try:
+            with self.connections.writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pokemon_fts'")
+                index_exists = cursor.fetchone() is not None
+                cursor.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS pokemon_fts USING fts5(
+                        name, type1, type2, description,
+                        content='pokemon', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS pokemon_fts_insert AFTER INSERT ON pokemon BEGIN
+                        INSERT INTO pokemon_fts(rowid, name, type1, type2, description)
+                        VALUES (new.id, new.name, new.type1, new.type2, new.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS pokemon_fts_delete AFTER DELETE ON pokemon BEGIN
+                        INSERT INTO pokemon_fts(pokemon_fts, rowid, name, type1, type2, description)
+                        VALUES ('delete', old.id, old.name, old.type1, old.type2, old.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS pokemon_fts_update
+                    AFTER UPDATE OF name, type1, type2, description ON pokemon BEGIN
+                        INSERT INTO pokemon_fts(pokemon_fts, rowid, name, type1, type2, description)
+                        VALUES ('delete', old.id, old.name, old.type1, old.type2, old.description);
+                        INSERT INTO pokemon_fts(rowid, name, type1, type2, description)
+                        VALUES (new.id, new.name, new.type1, new.type2, new.description);
+                    END;
+                """)
+                if not index_exists:
+                    # Index rows that were stored before the search index existed
+                    cursor.execute("INSERT INTO pokemon_fts(pokemon_fts) VALUES ('rebuild')")
+            logging.info("Pokemon search index created or already exists.")
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Full-text search unavailable, falling back to LIKE: {e}")
+            return False
+
+    def fetch_pokemon_documents(self, pokemon_url):
+        """Fetches the raw pokemon and species JSON documents for a Pokémon from the PokeAPI."""
         try:
             response = http.get(pokemon_url, timeout=10)  # Set a timeout for the request
             response.raise_for_status()
-
             pokemon_data = response.json()
+
             species_url = pokemon_data['species']['url']
             species_response = http.get(species_url, timeout=10)  # Set a timeout for the request
             species_response.raise_for_status()
             species_data = species_response.json()
 
-            # Basic Data
-            id = pokemon_data['id']
-            name = pokemon_data['name']
-            type1 = pokemon_data['types'][0]['type']['name']
-            type2 = pokemon_data['types'][1]['type']['name'] if len(pokemon_data['types']) > 1 else None
-            hp = pokemon_data['stats'][0]['base_stat']
-            attack = pokemon_data['stats'][1]['base_stat']
-            defense = pokemon_data['stats'][2]['base_stat']
-            sp_atk = pokemon_data['stats'][3]['base_stat']
-            sp_def = pokemon_data['stats'][4]['base_stat']
-            speed = pokemon_data['stats'][5]['base_stat']
-            sprite_front = pokemon_data.get('sprites', {}).get('front_default')
-            sprite_back = pokemon_data.get('sprites', {}).get('back_default')
-
-            # Description (English only)
-            description = None
-            for entry in species_data.get('flavor_text_entries', []):
-                if entry['language']['name'] == 'en':
-                    description = entry['flavor_text']
-                    break
-
-            return (
-                id,
-                name,
-                type1,
-                type2,
-                hp,
-                attack,
-                defense,
-                sp_atk,
-                sp_def,
-                speed,
-                sprite_front,
-                sprite_back,
-                description
-            )
+            return pokemon_data, species_data
 
         except requests.exceptions.RequestException as e:
             logging.error(f"Error fetching Pokémon data from {pokemon_url}: {e}")
             return None
 
+    def parse_pokemon_data(self, pokemon_data, species_data):
+        """Maps the pokemon and species JSON documents onto a pokemon table row."""
+        # Basic Data
+        id = pokemon_data['id']
+        name = pokemon_data['name']
+        type1 = pokemon_data['types'][0]['type']['name']
+        type2 = pokemon_data['types'][1]['type']['name'] if len(pokemon_data['types']) > 1 else None
+        hp = pokemon_data['stats'][0]['base_stat']
+        attack = pokemon_data['stats'][1]['base_stat']
+        defense = pokemon_data['stats'][2]['base_stat']
+        sp_atk = pokemon_data['stats'][3]['base_stat']
+        sp_def = pokemon_data['stats'][4]['base_stat']
+        speed = pokemon_data['stats'][5]['base_stat']
+        sprite_front = pokemon_data.get('sprites', {}).get('front_default')
+        sprite_back = pokemon_data.get('sprites', {}).get('back_default')
+
+        # Description (English only)
+        description = None
+        for entry in species_data.get('flavor_text_entries', []):
+            if entry['language']['name'] == 'en':
+                description = entry['flavor_text']
+                break
+
+        return (
+            id,
+            name,
+            type1,
+            type2,
+            hp,
+            attack,
+            defense,
+            sp_atk,
+            sp_def,
+            speed,
+            sprite_front,
+            sprite_back,
+            description
+        )
+
+    def _remember_evolution_chain_url(self, pokemon_id, species_data):
+        """Keeps the evolution chain URL from a species document so it is not fetched again."""
+        evolution_chain = species_data.get('evolution_chain')
+        self._evolution_chain_urls[pokemon_id] = evolution_chain['url'] if evolution_chain else None
+
+    def fetch_pokemon_data(self, pokemon_url):
+        """Fetches pokemon data from the PokeAPI, including sprites."""
+        documents = self.fetch_pokemon_documents(pokemon_url)
+        if documents is None:
+            return None
+        return self.parse_pokemon_data(*documents)
+
     def insert_pokemon(self, pokemon):
         """Inserts a new pokemon into the pokemon table, including sprites."""
         sql = """ 
@@ -140,119 +357,680 @@ class PokemonDataManager:
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) 
         """
         try:
-            cur = self.conn.cursor()
-            cur.execute(sql, pokemon)
-            self.conn.commit()
+            with self.connections.writer() as conn:
+                cur = conn.execute(sql, pokemon)
+            self._invalidate_pokemon([pokemon[0]])
             logging.info(f"Inserted Pokémon with ID {cur.lastrowid}")
             return cur.lastrowid
         except sqlite3.Error as e:
             logging.error(f"Error inserting Pokémon: {e}")
 
-    def populate_database(self, batch_size=50):
-        """Populates the database with pokemon data."""
-        cursor = self.conn.cursor()
+    def create_sync_state_table(self):
+        """Creates the sync_state table that records ingestion progress, if it doesn't exist.
+
+        Each row marks one completed unit of work for a resource: a list ``page``
+        (keyed by "offset:limit"), an ``entity`` (keyed by its PokeAPI id) or the
+        whole ``resource`` (keyed by "complete").
+        """
+        sql_create_sync_state_table = """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            resource TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            synced_at REAL NOT NULL,
+            PRIMARY KEY (resource, kind, key)
+        ) WITHOUT ROWID;
+        """
+        try:
+            with self.connections.writer() as conn:
+                conn.execute(sql_create_sync_state_table)
+            logging.info("Sync state table created or already exists.")
+        except sqlite3.Error as e:
+            logging.error(f"Error creating sync state table: {e}")
+
+    def mark_synced(self, resource, kind, keys):
+        """Records the given keys of a resource as completed."""
+        synced_at = time.time()
+        try:
+            with self.connections.writer() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sync_state (resource, kind, key, synced_at) VALUES (?, ?, ?, ?)",
+                    [(resource, kind, str(key), synced_at) for key in keys],
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Error recording sync state for {resource}/{kind}: {e}")
+
+    def get_synced_keys(self, resource, kind):
+        """Returns the set of keys recorded as completed for a resource."""
+        try:
+            cursor = self.connections.reader().cursor()
+            cursor.execute("SELECT key FROM sync_state WHERE resource = ? AND kind = ?", (resource, kind))
+            return {row[0] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            logging.error(f"Error reading sync state for {resource}/{kind}: {e}")
+            return set()
+
+    def is_resource_synced(self, resource):
+        """Returns True once a populate_* run has completed the whole resource."""
+        return "complete" in self.get_synced_keys(resource, "resource")
+
+    def _existing_ids(self, table, ids):
+        """Returns which of the given ids are already stored in ``table``, using a single query."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return set()
+        placeholders = ", ".join("?" * len(ids))
+        try:
+            cursor = self.connections.reader().cursor()
+            cursor.execute(f"SELECT id FROM {table} WHERE id IN ({placeholders})", ids)
+            return {row[0] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            logging.error(f"Error checking existing rows in {table}: {e}")
+            return set()
+
+    def _executemany_in_batches(self, sql, rows, batch_size=None):
+        """Runs ``sql`` for every row with executemany, committing once per batch of rows."""
+        batch_size = batch_size or config.DB_WRITE_BATCH_SIZE
+        rows = list(rows)
+        written = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            with self.connections.writer() as conn:  # One transaction (and one fsync) per batch
+                cur = conn.executemany(sql, batch)
+            written += cur.rowcount
+        return written
+
+    def insert_pokemon_many(self, pokemon_rows, batch_size=None, update_existing=False):
+        """Inserts many pokemon in one transaction per batch.
+
+        Rows already stored are skipped, or updated in place (keeping is_favorite)
+        when ``update_existing`` is True.
+        """
+        sql = """
+        INSERT INTO pokemon(id, name, type1, type2, hp, attack, defense, sp_atk, sp_def,
+                        speed, sprite_front, sprite_back, description)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        if update_existing:
+            sql += """
+        ON CONFLICT(id) DO UPDATE SET
+            name = excluded.name, type1 = excluded.type1, type2 = excluded.type2,
+            hp = excluded.hp, attack = excluded.attack, defense = excluded.defense,
+            sp_atk = excluded.sp_atk, sp_def = excluded.sp_def, speed = excluded.speed,
+            sprite_front = excluded.sprite_front, sprite_back = excluded.sprite_back,
+            description = excluded.description
+            """
+        else:
+            sql += " ON CONFLICT(id) DO NOTHING"
+        pokemon_rows = list(pokemon_rows)
+        try:
+            inserted = self._executemany_in_batches(sql, pokemon_rows, batch_size)
+            logging.info(f"Inserted {inserted} Pokémon")
+            return inserted
+        except sqlite3.Error as e:
+            logging.error(f"Error inserting Pokémon batch: {e}")
+            return 0
+        finally:
+            self._invalidate_pokemon([row[0] for row in pokemon_rows])
+
+    def populate_database(self, batch_size=50, workers=None, download_sprites=False):
+        """Populates the database with pokemon data.
+
+        The list is walked one page of ``batch_size`` Pokémon at a time. A pool of
+        ``workers`` threads fetches the pokemon/species documents of the page, the
+        calling thread parses each result as it arrives, and once every fetch for
+        the page has finished it writes the whole page (as the only writer) with
+        one insert_pokemon_many. Only then is the next list page requested.
+        Throughput is logged once the run is complete.
+
+        Completed pages are recorded in sync_state, so an interrupted run resumes
+        without re-requesting pages or Pokémon it already stored. With
+        ``download_sprites`` every missing sprite is then downloaded to the sprite store.
+        """
+        if self.is_resource_synced("pokemon"):
+            logging.info("Pokémon already fully synced, nothing to populate.")
+            if download_sprites:
+                self.download_all_sprites(workers)
+            return 0
+
+        workers = workers or config.INGEST_WORKERS
+        completed_pages = self.get_synced_keys("pokemon", "page")
         offset = 0  # Start from the beginning
+        inserted = 0
+        all_pages_complete = True
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pokeapi-fetch") as executor:
+            while True:
+                page_key = f"{offset}:{batch_size}"
+                if page_key in completed_pages:
+                    offset += batch_size
+                    continue  # Finished by an earlier run
 
-        while True:
-            url = f'{config.POKEAPI_BASE_URL}pokemon?limit={batch_size}&offset={offset}'
-            response = http.get(url, timeout=10)  # Set a timeout for the request
+                url = f'{config.POKEAPI_BASE_URL}pokemon?limit={batch_size}&offset={offset}'
+                response = http.get(url, timeout=10)  # Set a timeout for the request
+
+                if response.status_code != 200:
+                    print(f"Failed to fetch data. Status code: {response.status_code}")
+                    break  # Stop fetching if there's an error
 
-            if response.status_code == 200:
                 pokemon_list = response.json()['results']
 
                 # Break the loop if there are no more Pokémon to fetch
                 if not pokemon_list:
+                    if all_pages_complete:
+                        self.mark_synced("pokemon", "resource", ["complete"])
                     break
 
-                # Fetch individual Pokemon data
-                for pokemon in pokemon_list:
-                    pokemon_url = pokemon['url']
-                    pokemon_id = pokemon_url.split('/')[-2]  # Extract the Pokemon id
-
-                    # Check if Pokemon already exists (using pokemon_url for uniqueness)
-                    cursor.execute("SELECT 1 FROM pokemon WHERE id = ?", (pokemon_id,))
-                    pokemon_exists = cursor.fetchone() is not None
+                # Only Pokémon that are not stored yet go through the pipeline
+                page_urls = {int(pokemon['url'].split('/')[-2]): pokemon['url'] for pokemon in pokemon_list}
+                existing_ids = self._existing_ids("pokemon", page_urls)
+                written, page_complete = self._ingest_pokemon(
+                    executor, [url for pokemon_id, url in page_urls.items() if pokemon_id not in existing_ids]
+                )
+                inserted += written
 
-                    if not pokemon_exists:
-                        pokemon_data = self.fetch_pokemon_data(pokemon_url)
-                        if pokemon_data:
-                            logging.info(f"Fetched Pokémon: {pokemon_data[1]} (ID: {pokemon_data[0]})")
-                            self.insert_pokemon(pokemon_data)
+                if page_complete:
+                    self.mark_synced("pokemon", "page", [page_key])
+                else:
+                    all_pages_complete = False
 
                 offset += batch_size
-                time.sleep(1)  # Introduce a delay between batch requests
 
-            else:
-                print(f"Failed to fetch data. Status code: {response.status_code}")
-                break  # Stop fetching if there's an error
-    def get_all_pokemon(self, search_term=None, limit=None, offset=0):
+        elapsed = time.perf_counter() - started
+        rate = inserted / elapsed if elapsed > 0 else 0.0
+        logging.info(f"Inserted {inserted} Pokémon in {elapsed:.1f}s ({rate:.2f} records/s, {workers} workers, "
+                     f"rate limiter: {rate_limiter.stats()})")
+        print(f"Inserted {inserted} Pokémon in {elapsed:.1f}s ({rate:.2f} records/s)")
+        if download_sprites:
+            self.download_all_sprites(workers)
+        return inserted
+
+    def download_all_sprites(self, workers=None):
+        """Downloads the front and back sprite of every stored Pokémon that the sprite store is missing."""
+        try:
+            cursor = self.connections.reader().cursor()
+            cursor.execute("SELECT id, sprite_front, sprite_back FROM pokemon ORDER BY id")
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Error reading sprite URLs: {e}")
+            return 0
+        sprites = [(pokemon_id, "front", front) for pokemon_id, front, _ in rows]
+        sprites += [(pokemon_id, "back", back) for pokemon_id, _, back in rows]
+        started = time.perf_counter()
+        downloaded = self.sprite_store.download_all(sprites, workers or config.INGEST_WORKERS)
+        print(f"Downloaded {downloaded} sprites in {time.perf_counter() - started:.1f}s")
+        if downloaded or not os.path.exists(config.SPRITE_ATLAS_FILE):
+            self.build_sprite_atlas()
+        return downloaded
+
+    def build_sprite_atlas(self):
+        """Packs the list icons of every stored Pokémon into the sprite atlas. Returns the number packed."""
+        try:
+            cursor = self.connections.reader().cursor()
+            cursor.execute("SELECT id FROM pokemon ORDER BY id")
+            pokemon_ids = [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logging.error(f"Error reading Pokémon ids for the sprite atlas: {e}")
+            return 0
+        if self._sprite_atlas:
+            self._sprite_atlas.close()
+        self._sprite_atlas = None
+        return build_sprite_atlas(self.sprite_store, pokemon_ids, config.SPRITE_ATLAS_FILE, config.SPRITE_ICON_SIZE)
+
+    def get_icon(self, pokemon_id):
+        """Returns a Pokémon's list icon (config.SPRITE_ICON_SIZE, RGBA) from the sprite atlas, or None."""
+        if self._sprite_atlas is None:
+            self._sprite_atlas = SpriteAtlas.open(config.SPRITE_ATLAS_FILE) or False
+        if not self._sprite_atlas:
+            return None
+        return self._sprite_atlas.get_image(pokemon_id)
+
+    def sprite_source(self, pokemon_id, variant="front"):
+        """Returns the image cache source key of a sprite."""
+        return ("sprite", pokemon_id, variant)
+
+    def get_sprite(self, pokemon_id, variant="front", download=True):
+        """Returns a Pokémon's sprite as a PIL image, resized to config.SPRITE_SIZE, or None.
+
+        Sprites come from the shared image cache or the local sprite store; one
+        that was never downloaded is fetched and stored on first use, unless
+        ``download`` is False.
+        """
+        def load():
+            image = self.sprite_store.load(pokemon_id, variant)
+            if image is None and download:
+                pokemon = self.get_pokemon_by_id(pokemon_id)
+                if pokemon is not None:
+                    image = self.sprite_store.get(pokemon_id, variant, pokemon[10 if variant == "front" else 11])
+            return image
+
+        return images.get_image(self.sprite_source(pokemon_id, variant), config.SPRITE_SIZE, loader=load)
+
+    def _ingest_pokemon(self, executor, pokemon_urls, update_existing=False):
+        """Runs the fetch/parse/write pipeline for a set of Pokémon URLs.
+
+        Fetches run on ``executor``; parsing and the bulk write run on the calling
+        thread. Returns (rows written, True if every fetch succeeded).
+        """
+        # Fetch stage: hand every Pokémon to the worker pool
+        pending = [executor.submit(self.fetch_pokemon_documents, url) for url in pokemon_urls]
+
+        # Parse and write stages run here, on the thread that owns the connection
+        rows = []
+        all_fetched = True
+        for future in as_completed(pending):
+            documents = future.result()
+            if documents is None:
+                all_fetched = False  # Retried on the next run
+                continue
+            pokemon_data = self.parse_pokemon_data(*documents)
+            self._remember_evolution_chain_url(pokemon_data[0], documents[1])
+            logging.info(f"Fetched Pokémon: {pokemon_data[1]} (ID: {pokemon_data[0]})")
+            rows.append(pokemon_data)
+        written = self.insert_pokemon_many(rows, update_existing=update_existing)
+
+        self.mark_synced("pokemon", "entity", [row[0] for row in rows])
+        return written, all_fetched
+
+    def _fetch_remote_count(self, resource):
+        """Returns the number of entries a PokeAPI list endpoint reports, using one small request."""
+        response = http.get(f"{config.POKEAPI_BASE_URL}{resource}?limit=1", timeout=10)
+        response.raise_for_status()
+        return response.json()['count']
+
+    def _fetch_remote_index(self, resource, count):
+        """Returns {id: url} for every entry of a PokeAPI list endpoint in a single request."""
+        response = http.get(f"{config.POKEAPI_BASE_URL}{resource}?limit={count}&offset=0", timeout=10)
+        response.raise_for_status()
+        return {int(entry['url'].split('/')[-2]): entry['url'] for entry in response.json()['results']}
+
+    def _stored_ids(self, table):
+        """Returns the set of ids stored in a table."""
+        cursor = self.connections.reader().cursor()
+        cursor.execute(f"SELECT id FROM {table}")
+        return {row[0] for row in cursor.fetchall()}
+
+    def _stale_ids(self, resource, table, cutoff, limit):
+        """Returns ids in ``table`` last synced before ``cutoff`` (or never recorded), oldest first."""
+        cursor = self.connections.reader().cursor()
+        cursor.execute(f"""
+            SELECT t.id FROM {table} t
+            LEFT JOIN sync_state s
+                ON s.resource = ? AND s.kind = 'entity' AND s.key = CAST(t.id AS TEXT)
+            WHERE s.synced_at IS NULL OR s.synced_at < ?
+            ORDER BY COALESCE(s.synced_at, 0), t.id
+            LIMIT ?
+        """, (resource, cutoff, -1 if limit is None else limit))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _stale_synced_keys(self, resource, cutoff, limit):
+        """Returns the entity keys of a resource without a table of its own last synced before ``cutoff``, oldest first."""
+        cursor = self.connections.reader().cursor()
+        cursor.execute("""
+            SELECT key FROM sync_state
+            WHERE resource = ? AND kind = 'entity' AND synced_at < ?
+            ORDER BY synced_at, key
+            LIMIT ?
+        """, (resource, cutoff, -1 if limit is None else limit))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _evolution_chain_urls_of(self, pokemon_ids):
+        """Returns the evolution chain URLs recorded for the given Pokémon during ingestion."""
+        urls = (self._evolution_chain_urls.get(pokemon_id) for pokemon_id in pokemon_ids)
+        return [url for url in urls if url]
+
+    def sync(self, refresh_older_than=None, refresh_limit=None, workers=None):
+        """Brings an existing database up to date with the PokeAPI.
+
+        For Pokémon, berries and evolution chains the remote ``count`` is compared
+        with what is stored. Only when they differ is the full list fetched (one
+        request) and the missing entries downloaded, so an up-to-date database
+        syncs in three requests.
+
+        The evolution chains of every Pokémon added are fetched again as well, since
+        a new evolution of an existing family does not change the chain count.
+
+        If ``refresh_older_than`` (seconds) is given, up to ``refresh_limit``
+        Pokémon, berries and evolution chains that were last synced longer ago
+        than that are fetched again and updated in place; favourites are kept.
+        The chains of the refreshed Pokémon are refreshed with them.
+
+        Returns a dict with the number of rows added or refreshed per resource.
+        """
+        workers = workers or config.INGEST_WORKERS
+        started = time.perf_counter()
+        summary = {"pokemon": 0, "berry": 0, "evolution-chain": 0, "refreshed": 0}
+        added_pokemon_ids = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pokeapi-fetch") as executor:
+                # Pokémon
+                remote_count = self._fetch_remote_count("pokemon")
+                stored_ids = self._stored_ids("pokemon")
+                if remote_count != len(stored_ids):
+                    remote_index = self._fetch_remote_index("pokemon", remote_count)
+                    added_pokemon_ids = [pokemon_id for pokemon_id in remote_index if pokemon_id not in stored_ids]
+                    summary["pokemon"], _ = self._ingest_pokemon(
+                        executor, [remote_index[pokemon_id] for pokemon_id in added_pokemon_ids]
+                    )
+
+                # Berries
+                remote_count = self._fetch_remote_count("berry")
+                stored_ids = self._stored_ids("berries")
+                if remote_count != len(stored_ids):
+                    remote_index = self._fetch_remote_index("berry", remote_count)
+                    missing = [url for berry_id, url in remote_index.items() if berry_id not in stored_ids]
+                    summary["berry"] = self._ingest_berries(executor, missing)
+
+                # Evolution chains: new ones, and those the added Pokémon belong to
+                chain_urls = self._evolution_chain_urls_of(added_pokemon_ids)
+                remote_count = self._fetch_remote_count("evolution-chain")
+                stored_chain_ids = {int(key) for key in self.get_synced_keys("evolution-chain", "entity")}
+                if remote_count != len(stored_chain_ids):
+                    remote_index = self._fetch_remote_index("evolution-chain", remote_count)
+                    chain_urls += [url for chain_id, url in remote_index.items() if chain_id not in stored_chain_ids]
+                if chain_urls:
+                    summary["evolution-chain"] = self._ingest_evolution_chains(chain_urls, refetch=True)
+
+                # Stale subset
+                if refresh_older_than is not None:
+                    cutoff = time.time() - refresh_older_than
+                    stale_pokemon = self._stale_ids("pokemon", "pokemon", cutoff, refresh_limit)
+                    refreshed, _ = self._ingest_pokemon(
+                        executor,
+                        [f"{config.POKEAPI_BASE_URL}pokemon/{pokemon_id}/" for pokemon_id in stale_pokemon],
+                        update_existing=True,
+                    )
+                    stale_berries = self._stale_ids("berry", "berries", cutoff, refresh_limit)
+                    refreshed += self._ingest_berries(
+                        executor,
+                        [f"{config.POKEAPI_BASE_URL}berry/{berry_id}/" for berry_id in stale_berries],
+                        update_existing=True,
+                    )
+                    stale_chains = self._stale_synced_keys("evolution-chain", cutoff, refresh_limit)
+                    chain_urls = self._evolution_chain_urls_of(stale_pokemon) + [
+                        f"{config.POKEAPI_BASE_URL}evolution-chain/{chain_id}/" for chain_id in stale_chains
+                    ]
+                    refreshed += self._ingest_evolution_chains(chain_urls, update_existing=True, refetch=True)
+                    summary["refreshed"] = refreshed
+
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error syncing with the PokeAPI: {e}")
+            print(f"Sync failed: {e}")
+
+        elapsed = time.perf_counter() - started
+        logging.info(f"Sync finished in {elapsed:.1f}s: {summary}, rate limiter: {rate_limiter.stats()}")
+        print(f"Sync finished in {elapsed:.1f}s: {summary}")
+        return summary
+
+    def get_all_pokemon(self, search_term=None, limit=None, offset=0, list_rows=False):
         """Fetches all Pokémon from the database, optionally filtered by search_term
-        and paginated using limit and offset."""
+        and paginated using limit and offset.
+
+        With ``list_rows`` only the list columns are read and PokemonListRow
+        tuples are returned instead of full records.
+        """
+        if search_term:
+            return self.search_pokemon(search_term, limit=limit, offset=offset, list_rows=list_rows)
         try:
-            cursor = self.conn.cursor()
-            if search_term:
-                query = "SELECT * FROM pokemon WHERE name LIKE ? ORDER BY id"
-                if limit:
-                    query += " LIMIT ? OFFSET ?"
-                    params = ('%' + search_term + '%', limit, offset)
-                else:
-                    params = ('%' + search_term + '%',)
+            cursor = self.connections.reader().cursor()
+            query = f"SELECT {LIST_COLUMNS if list_rows else '*'} FROM pokemon ORDER BY id"
+            if limit:
+                query += " LIMIT ? OFFSET ?"
+                params = (limit, offset)
             else:
-                query = "SELECT * FROM pokemon ORDER BY id"
-                if limit:
-                    query += " LIMIT ? OFFSET ?"
-                    params = (limit, offset)
-                else:
-                    params = ()
+                params = ()
 
             cursor.execute(query, params)
-            return cursor.fetchall()
+            rows = cursor.fetchall()
+            return list(map(PokemonListRow._make, rows)) if list_rows else rows
 
         except sqlite3.Error as e:
             logging.error(f"Error fetching all Pokémon: {e}")
         return []
 
+    def _filter_clause(self, filters):
+        """Builds the WHERE conditions and parameters for a get_pokemon_page filters dict.
+
+        Supported filters (combined with AND):
+            "search":    free text, matched like search_pokemon (name, type, description)
+            "favorites": True to return favourites only
+            "types":     a type name or a list of them; each must be one of the Pokémon's two types
+            "stats":     {stat column: (min, max)}, inclusive, either bound may be None
+
+        parse_filter_query builds this dict from search bar text.
+        """
+        conditions, params = [], []
+        filters = filters or {}
+        if filters.get("search"):
+            if self.fts_enabled:
+                conditions.append("id IN (SELECT rowid FROM pokemon_fts WHERE pokemon_fts MATCH ?)")
+                params.append(self._fts_match_expression(filters["search"]) or '""')
+            else:
+                pattern = '%' + filters["search"] + '%'
+                conditions.append("(name LIKE ? OR type1 LIKE ? OR type2 LIKE ? OR description LIKE ?)")
+                params.extend([pattern] * 4)
+        if filters.get("favorites"):
+            conditions.append("is_favorite = 1")
+        types = filters.get("types") or []
+        for pokemon_type in [types] if isinstance(types, str) else types:
+            conditions.append("(type1 = ? OR type2 = ?)")
+            params.extend([pokemon_type.lower()] * 2)
+        for stat, (low, high) in (filters.get("stats") or {}).items():
+            if stat not in STAT_COLUMNS:
+                raise ValueError(f"Unsupported stat filter: {stat}")
+            if low is not None:
+                conditions.append(f"{stat} >= ?")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{stat} <= ?")
+                params.append(high)
+        return conditions, params
+
+    def count_pokemon(self, filters=None):
+        """Returns how many Pokémon match a get_pokemon_page filters dict."""
+        conditions, params = self._filter_clause(filters)
+        query = "SELECT COUNT(*) FROM pokemon"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        try:
+            cursor = self.connections.reader().cursor()
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            logging.error(f"Error counting Pokémon: {e}")
+            return 0
+
+    def get_pokemon_page(self, after_id=None, limit=50, filters=None, before_id=None):
+        """Fetches one page of Pokémon in id order using keyset pagination.
+
+        Pass ``after_id`` (a previous page's next_cursor) to page forwards, or
+        ``before_id`` (a prev_cursor) to page backwards; with neither, the first
+        page is returned. Each page costs one index range scan however deep it
+        is, unlike LIMIT/OFFSET. Rows are PokemonListRow tuples, always in
+        ascending id order.
+        """
+        conditions, params = self._filter_clause(filters)
+        backwards = before_id is not None
+        if backwards:
+            conditions.append("id < ?")
+            params.append(before_id)
+        elif after_id is not None:
+            conditions.append("id > ?")
+            params.append(after_id)
+
+        query = f"SELECT {LIST_COLUMNS} FROM pokemon"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY id {'DESC' if backwards else 'ASC'} LIMIT ?"
+        params.append(limit + 1)  # One extra row tells whether another page follows
+
+        try:
+            cursor = self.connections.reader().cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Error fetching Pokémon page: {e}")
+            return PokemonPage([], None, None)
+
+        has_more = len(rows) > limit
+        rows = list(map(PokemonListRow._make, rows[:limit]))
+        if backwards:
+            rows.reverse()
+            prev_cursor = rows[0].id if has_more else None
+            next_cursor = rows[-1].id if rows else None
+        else:
+            next_cursor = rows[-1].id if has_more else None
+            prev_cursor = rows[0].id if rows and after_id is not None else None
+        return PokemonPage(rows, next_cursor, prev_cursor)
+
+    def _fts_match_expression(self, search_term):
+        """Turns free text into an FTS5 query that prefix-matches every word."""
+        words = re.findall(r"\w+", search_term.lower())
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search_pokemon(self, search_term, limit=None, offset=0, list_rows=False):
+        """Searches Pokémon by name, type and description, best matches first.
+
+        Every word of ``search_term`` must prefix-match a word in one of those
+        columns. Results are ranked with bm25, weighting name over type over
+        description, and paginated using limit and offset. With ``list_rows``
+        PokemonListRow tuples are returned instead of full records.
+        """
+        columns = LIST_COLUMNS if list_rows else '*'
+        try:
+            cursor = self.connections.reader().cursor()
+            if self.fts_enabled:
+                match = self._fts_match_expression(search_term)
+                if not match:
+                    return []
+                query = f"""
+                    SELECT {', '.join('p.' + column for column in columns.split(', '))} FROM pokemon_fts
+                    JOIN pokemon p ON p.id = pokemon_fts.rowid
+                    WHERE pokemon_fts MATCH ?
+                    ORDER BY bm25(pokemon_fts, 10.0, 5.0, 5.0, 1.0), p.id
+                    LIMIT ? OFFSET ?
+                """
+                params = (match, limit or -1, offset)
+            else:
+                pattern = '%' + search_term + '%'
+                query = f"""
+                    SELECT {columns} FROM pokemon
+                    WHERE name LIKE ? OR type1 LIKE ? OR type2 LIKE ? OR description LIKE ?
+                    ORDER BY id LIMIT ? OFFSET ?
+                """
+                params = (pattern, pattern, pattern, pattern, limit or -1, offset)
+
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            return list(map(PokemonListRow._make, rows)) if list_rows else rows
+
+        except sqlite3.Error as e:
+            logging.error(f"Error searching Pokémon for '{search_term}': {e}")
+        return []
+
+    def get_favourites(self, order_by="id", limit=None, offset=0):
+        """Fetches favourite Pokémon as PokemonListRow tuples, ordered by "id" or "name".
+
+        Served from the partial favourites indexes, so the cost depends on the
+        number of favourites rather than the size of the Pokédex.
+        """
+        if order_by not in ("id", "name"):
+            raise ValueError(f"Unsupported favourites order: {order_by}")
+        try:
+            cursor = self.connections.reader().cursor()
+            # The literal is_favorite = 1 lets SQLite match the partial index predicate
+            cursor.execute(
+                f"SELECT {LIST_COLUMNS} FROM pokemon WHERE is_favorite = 1 ORDER BY {order_by} LIMIT ? OFFSET ?",
+                (limit or -1, offset),
+            )
+            return list(map(PokemonListRow._make, cursor.fetchall()))
+        except sqlite3.Error as e:
+            logging.error(f"Error fetching favourite Pokémon: {e}")
+            return []
+
     def get_pokemon_by_id(self, pokemon_id):
-        """Fetches a Pokémon by its ID from the database.
+        """Fetches a Pokémon by its ID, from the record cache or the database.
         If not found in the database, fetches from PokeAPI and inserts into the database.
         """
+        key = ("pokemon", pokemon_id)
+        pokemon = self.record_cache.get(key)
+        if pokemon is not None:
+            return pokemon
+        # Taken before the read, so a row a concurrent write makes stale is not cached
+        generation = self.record_cache.generation(key)
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM pokemon WHERE id = ?", (pokemon_id,))
-            pokemon = cursor.fetchone()
-            if pokemon:
-                return pokemon
-
-            # Fetch from PokeAPI if not in database
-            pokemon_url = f"{config.POKEAPI_BASE_URL}pokemon/{pokemon_id}"
-            pokemon_data = self.fetch_pokemon_data(pokemon_url)
-            if pokemon_data:
+            pokemon = self._select_pokemon(pokemon_id)
+            if pokemon is None:
+                # Fetch from PokeAPI if not in database
+                pokemon_url = f"{config.POKEAPI_BASE_URL}pokemon/{pokemon_id}"
+                pokemon_data = self.fetch_pokemon_data(pokemon_url)
+                if not pokemon_data:
+                    return None
                 self.insert_pokemon(pokemon_data)
-                return pokemon_data
-            else:
-                return None
+                generation = self.record_cache.generation(key)  # insert_pokemon invalidated the key
+                # Re-read the stored row so callers always get the same columns (is_favorite included)
+                pokemon = self._select_pokemon(pokemon_id)
+            if pokemon is not None:
+                self.record_cache.put(key, pokemon, generation)
+            return pokemon
 
         except sqlite3.Error as e:
             logging.error(f"Error fetching Pokémon by ID {pokemon_id}: {e}")
             return None
 
 
+    def _select_pokemon(self, pokemon_id):
+        cursor = self.connections.reader().cursor()
+        cursor.execute("SELECT * FROM pokemon WHERE id = ?", (pokemon_id,))
+        return cursor.fetchone()
+
+    def _invalidate_pokemon(self, pokemon_ids):
+        """Drops the cached records of the given Pokémon and of the evolution families naming them."""
+        pokemon_ids = set(pokemon_ids)
+        for pokemon_id in pokemon_ids:
+            self.record_cache.invalidate(("pokemon", pokemon_id))
+        self.record_cache.invalidate_where(
+            lambda key, family: key[0] == "family" and any(m.pokemon_id in pokemon_ids for m in family)
+        )
+
+    def cache_stats(self):
+        """Returns the record, decoded image and photo image cache counters (entries, hits, misses, evictions, hit rate)."""
+        return {"records": self.record_cache.stats(), **images.stats()}
+
     def update_favorite_status(self, pokemon_id, is_favorite):
-        """Updates the favorite status of a Pokémon."""
+        """Updates the favorite status of a Pokémon.
+
+        Returns the updated PokemonListRow, read back in the same transaction,
+        so list views can patch that one row; None if the update failed.
+        """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("UPDATE pokemon SET is_favorite = ? WHERE id = ?", (is_favorite, pokemon_id))
-            self.conn.commit()
+            with self.connections.writer() as conn:
+                conn.execute("UPDATE pokemon SET is_favorite = ? WHERE id = ?", (int(is_favorite), pokemon_id))
+                row = conn.execute(f"SELECT {LIST_COLUMNS} FROM pokemon WHERE id = ?", (pokemon_id,)).fetchone()
+            self.record_cache.invalidate(("pokemon", pokemon_id))
             logging.info(f"Updated favorite status for Pokémon {pokemon_id} to {is_favorite}")
+            return PokemonListRow._make(row) if row else None
         except sqlite3.Error as e:
             logging.error(f"Error updating favorite status for Pokémon {pokemon_id}: {e}")
+            return None
 
 
     def close_connection(self):
-        """Closes the database connection."""
-        if self.conn:
-            self.conn.close()
-            logging.info("Database connection closed.")
+        """Closes the writer connection and every thread's reader connection."""
+        if self.connections:
+            if config.SQLITE_OPTIMIZE_ON_CLOSE:
+                try:
+                    with self.connections.writer() as conn:
+                        conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logging.error(f"Error optimizing database: {e}")
+            self.connections.close()
+            logging.info("Database connections closed.")
+        if self._sprite_atlas:
+            self._sprite_atlas.close()
+            self._sprite_atlas = None
 
 
     def create_berries_table(self):
@@ -272,8 +1050,8 @@ class PokemonDataManager:
                     );
                     """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(sql_create_berries_table)
+            with self.connections.writer() as conn:
+                conn.execute(sql_create_berries_table)
             logging.info("Berries table created or already exists.")
         except sqlite3.Error as e:
             logging.error(f"Error creating berries table: {e}")
@@ -284,28 +1062,28 @@ class PokemonDataManager:
         try:
             response = http.get(berry_url)
             response.raise_for_status()
-
-            berry_data = response.json()
-
-            # Extract relevant berry data
-            id = berry_data['id']
-            name = berry_data['name']
-            growth_time = berry_data['growth_time']
-            max_harvest = berry_data['max_harvest']
-            natural_gift_power = berry_data['natural_gift_power']
-            size = berry_data['size']
-            smoothness = berry_data['smoothness']
-            soil_dryness = berry_data['soil_dryness']
-            firmness = berry_data['firmness']['name']
-            flavors = ', '.join([f["flavor"]["name"] for f in berry_data['flavors']])
-
-            return (id, name, growth_time, max_harvest, natural_gift_power, size, smoothness,
-                    soil_dryness, firmness, flavors)
+            return self.parse_berry_data(response.json())
 
         except requests.exceptions.RequestException as e:
             logging.error(f"Error fetching berry data from {berry_url}: {e}")
             return None
 
+    def parse_berry_data(self, berry_data):
+        """Maps a berry JSON document onto a berries table row."""
+        id = berry_data['id']
+        name = berry_data['name']
+        growth_time = berry_data['growth_time']
+        max_harvest = berry_data['max_harvest']
+        natural_gift_power = berry_data['natural_gift_power']
+        size = berry_data['size']
+        smoothness = berry_data['smoothness']
+        soil_dryness = berry_data['soil_dryness']
+        firmness = berry_data['firmness']['name']
+        flavors = ', '.join([f["flavor"]["name"] for f in berry_data['flavors']])
+
+        return (id, name, growth_time, max_harvest, natural_gift_power, size, smoothness,
+                soil_dryness, firmness, flavors)
+
 
     def insert_berry(self, berry):
         """Inserts a new berry into the berries table."""
@@ -315,30 +1093,81 @@ class PokemonDataManager:
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """
         try:
-            cur = self.conn.cursor()
-            cur.execute(sql, berry)
-            self.conn.commit()
+            with self.connections.writer() as conn:
+                cur = conn.execute(sql, berry)
+            self.record_cache.invalidate(("berry", berry[0]))
             logging.info(f"Inserted Berry with ID {cur.lastrowid}")
             return cur.lastrowid
         except sqlite3.Error as e:
             logging.error(f"Error inserting berry: {e}")
 
 
+    def insert_berries_many(self, berries, batch_size=None, update_existing=False):
+        """Inserts many berries in one transaction per batch.
+
+        Rows already stored are skipped, or replaced when ``update_existing`` is True.
+        """
+        sql = f"""
+                    INSERT OR {'REPLACE' if update_existing else 'IGNORE'} INTO berries (
+                                         id, name, growth_time, max_harvest, natural_gift_power, size,
+                                         smoothness, soil_dryness, firmness, flavors)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """
+        berries = list(berries)
+        try:
+            inserted = self._executemany_in_batches(sql, berries, batch_size)
+            logging.info(f"Inserted {inserted} berries")
+            return inserted
+        except sqlite3.Error as e:
+            logging.error(f"Error inserting berry batch: {e}")
+            return 0
+        finally:
+            for berry in berries:
+                self.record_cache.invalidate(("berry", berry[0]))
+
     def populate_berries_table(self, num_berries=None):
-        """Populates the database with berry data."""
-        if num_berries is None:
+        """Populates the database with berry data, skipping berries that are already stored."""
+        fetch_all = num_berries is None
+        if fetch_all:
+            if self.is_resource_synced("berry"):
+                logging.info("Berries already fully synced, nothing to populate.")
+                return
             # Fetch the total number of berries from the API
             response = http.get(f"{config.POKEAPI_BASE_URL}berry")
             response.raise_for_status()
             num_berries = response.json()['count']
 
+        existing_ids = self._existing_ids("berries", range(1, num_berries + 1))
+        all_fetched = True
+        berries = []
         for berry_id in range(1, num_berries + 1):
+            if berry_id in existing_ids:
+                continue
             berry_url = f"{config.POKEAPI_BASE_URL}berry/{berry_id}"
             berry_data = self.fetch_berry_data(berry_url)
             if berry_data:
-                self.insert_berry(berry_data)
-                logging.info(f"Fetched and inserted berry: {berry_data[1]} (ID: {berry_data[0]})")
-            time.sleep(0.2)  # Add a small delay to avoid overwhelming the API
+                berries.append(berry_data)
+                logging.info(f"Fetched berry: {berry_data[1]} (ID: {berry_data[0]})")
+            else:
+                all_fetched = False
+            if len(berries) >= config.DB_WRITE_BATCH_SIZE:
+                self._write_berries(berries)
+                berries = []
+        self._write_berries(berries)
+
+        if fetch_all and all_fetched:
+            self.mark_synced("berry", "resource", ["complete"])
+
+    def _write_berries(self, berries, update_existing=False):
+        """Writes a batch of fetched berries and records them in sync_state."""
+        written = self.insert_berries_many(berries, update_existing=update_existing)
+        self.mark_synced("berry", "entity", [berry[0] for berry in berries])
+        return written
+
+    def _ingest_berries(self, executor, berry_urls, update_existing=False):
+        """Fetches the given berries on ``executor`` and writes them in one batch."""
+        berries = [berry for berry in executor.map(self.fetch_berry_data, berry_urls) if berry]
+        return self._write_berries(berries, update_existing=update_existing)
 
 
     def create_evolutions_table(self):
@@ -356,39 +1185,185 @@ class PokemonDataManager:
                     );
                     """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(sql_create_evolutions_table)
+            with self.connections.writer() as conn:
+                conn.execute(sql_create_evolutions_table)
+                # Older databases may hold the same edge several times; keep the first copy
+                conn.execute("""
+                    DELETE FROM evolutions WHERE id NOT IN (
+                        SELECT MIN(id) FROM evolutions GROUP BY pokemon_id, evolves_to_id
+                    )
+                """)
+                conn.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_evolutions_edge
+                    ON evolutions (pokemon_id, evolves_to_id)
+                """)
             logging.info("Evolutions table created or already exists.")
         except sqlite3.Error as e:
             logging.error(f"Error creating evolutions table: {e}")
 
 
+    def create_evolution_families_table(self):
+        """Creates the evolution_families table if it doesn't exist.
+
+        It stores every evolution family flattened: one row per member with its
+        stage and parent, keyed by the family's base Pokémon. A family can then be
+        read in either direction with indexed lookups instead of a recursive
+        query over evolutions. It is built from evolutions on first creation.
+        """
+        sql_create_evolution_families_table = """
+                    CREATE TABLE IF NOT EXISTS evolution_families (
+                        family_id INTEGER NOT NULL,
+                        pokemon_id INTEGER NOT NULL,
+                        stage INTEGER NOT NULL,
+                        parent_id INTEGER,
+                        trigger TEXT,
+                        level INTEGER,
+                        item TEXT,
+                        PRIMARY KEY (family_id, stage, pokemon_id)
+                    ) WITHOUT ROWID;
+                    """
+        try:
+            with self.connections.writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'evolution_families'")
+                table_exists = cursor.fetchone() is not None
+                cursor.execute(sql_create_evolution_families_table)
+                # Member -> family lookups; covering, so they never touch the table
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_evolution_families_member
+                    ON evolution_families (pokemon_id, family_id)
+                """)
+                evolutions = None
+                if not table_exists:
+                    cursor.execute("SELECT pokemon_id, evolves_to_id, trigger, level, item FROM evolutions")
+                    evolutions = cursor.fetchall()
+            if evolutions is not None:
+                self.insert_evolution_families_many(self.build_evolution_families(evolutions))
+            logging.info("Evolution families table created or already exists.")
+        except sqlite3.Error as e:
+            logging.error(f"Error creating evolution families table: {e}")
+
+    def build_evolution_families(self, evolutions, member_ids=()):
+        """Flattens evolution edges into evolution_families rows.
+
+        ``evolutions`` are (pokemon_id, evolves_to_id, trigger, level, item) edges;
+        ``member_ids`` adds Pokémon that belong to a family without evolving
+        (single-stage species). Each connected family is keyed by its base Pokémon.
+        """
+        parents = {}
+        children = {}
+        for pokemon_id, evolves_to_id, trigger, level, item in evolutions:
+            parents[evolves_to_id] = (pokemon_id, trigger, level, item)
+            children.setdefault(pokemon_id, []).append(evolves_to_id)
+
+        nodes = set(member_ids) | set(parents) | set(children)
+        rows = []
+        for root_id in sorted(nodes - set(parents)):
+            rows.append((root_id, root_id, 1, None, None, None, None))
+            stage_members = [root_id]
+            stage = 1
+            while stage_members:
+                stage += 1
+                next_members = []
+                for parent_id in stage_members:
+                    for child_id in children.get(parent_id, []):
+                        _, trigger, level, item = parents[child_id]
+                        rows.append((root_id, child_id, stage, parent_id, trigger, level, item))
+                        next_members.append(child_id)
+                stage_members = next_members
+        return rows
+
+    def insert_evolution_families_many(self, family_rows, batch_size=None):
+        """Inserts or replaces evolution_families rows in one transaction per batch."""
+        sql = """
+                    INSERT OR REPLACE INTO evolution_families
+                        (family_id, pokemon_id, stage, parent_id, trigger, level, item)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        family_rows = list(family_rows)
+        try:
+            return self._executemany_in_batches(sql, family_rows, batch_size)
+        except sqlite3.Error as e:
+            logging.error(f"Error inserting evolution family batch: {e}")
+            return 0
+        finally:
+            # A new member changes the family of every Pokémon already in it
+            member_ids = {row[1] for row in family_rows}
+            self.record_cache.invalidate_where(
+                lambda key, family: key[0] == "family" and (
+                    key[1] in member_ids or any(m.pokemon_id in member_ids for m in family))
+            )
+
     def fetch_evolution_data(self, pokemon_id):
-        """Fetches evolution chain data for a given Pokemon from the PokeAPI."""
+        """Fetches evolution chain data for a given Pokemon from the PokeAPI.
+
+        Returns None if the data could not be fetched.
+        """
+        evolution_chain_url = self.get_evolution_chain_url(pokemon_id)
+        if evolution_chain_url is None:
+            return None
+        chain = self.fetch_evolution_chain(evolution_chain_url)
+        if chain is None:
+            return None
+        return list(chain[0])
+
+    def get_evolution_chain_url(self, pokemon_id):
+        """Returns the evolution chain URL for a Pokemon, fetching its species only if needed.
+
+        Returns None if the species could not be fetched, or if the Pokémon has no chain;
+        ``has_no_evolution_chain`` tells the two apart.
+        """
+        if pokemon_id in self._evolution_chain_urls:
+            return self._evolution_chain_urls[pokemon_id]
         try:
-            # Get the Pokemon's species information
             species_url = f"{config.POKEAPI_BASE_URL}pokemon-species/{pokemon_id}/"
-            species_response = http.get(species_url)
+            species_response = http.get(species_url, timeout=10)
+            if species_response.status_code == 404:
+                # Alternate forms (ids 10001+) have no species document under their own id
+                logging.info(f"No species document for Pokemon {pokemon_id}, treating it as having no evolution chain")
+                self._evolution_chain_urls[pokemon_id] = None
+                return None
             species_response.raise_for_status()
-            species_data = species_response.json()
+            self._remember_evolution_chain_url(pokemon_id, species_response.json())
+            return self._evolution_chain_urls.get(pokemon_id)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error fetching species data for Pokemon {pokemon_id}: {e}")
+            return None
+
+    def has_no_evolution_chain(self, pokemon_id):
+        """Returns True if the Pokémon is known to have no evolution chain (as opposed to a failed fetch)."""
+        return pokemon_id in self._evolution_chain_urls and self._evolution_chain_urls[pokemon_id] is None
 
-            # Get the evolution chain URL
-            evolution_chain_url = species_data['evolution_chain']['url']
+    def fetch_evolution_chain(self, evolution_chain_url):
+        """Fetches and parses an evolution chain, once per chain URL.
 
-            # Fetch the evolution chain data
-            evolution_chain_response = http.get(evolution_chain_url)
+        Returns a tuple of (evolutions, member_ids), or None if the chain could not be fetched.
+        """
+        if evolution_chain_url in self._evolution_chains:
+            return self._evolution_chains[evolution_chain_url]
+        try:
+            evolution_chain_response = http.get(evolution_chain_url, timeout=10)
             evolution_chain_response.raise_for_status()
             evolution_chain_data = evolution_chain_response.json()
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error fetching evolution chain {evolution_chain_url}: {e}")
+            return None
 
-            # Parse the evolution chain data
-            evolutions = []
-            self._parse_evolution_chain(evolution_chain_data['chain'], evolutions)
+        # Parse the evolution chain data
+        evolutions = []
+        self._parse_evolution_chain(evolution_chain_data['chain'], evolutions)
+        member_ids = self._evolution_chain_members(evolution_chain_data['chain'])
 
-            return evolutions
+        chain = (tuple(evolutions), frozenset(member_ids))
+        self._evolution_chains[evolution_chain_url] = chain
+        return chain
 
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error fetching evolution data for Pokemon {pokemon_id}: {e}")
-            return []
+    def _evolution_chain_members(self, chain_link):
+        """Returns the species ids of every Pokemon in an evolution chain link and its descendants."""
+        member_ids = {int(chain_link['species']['url'].split('/')[-2])}
+        for evolution_detail in chain_link['evolves_to']:
+            member_ids |= self._evolution_chain_members(evolution_detail)
+        return member_ids
 
     def _parse_evolution_chain(self, chain_link, evolutions):
         """Recursively parses an evolution chain link and extracts evolution data."""
@@ -399,9 +1374,9 @@ class PokemonDataManager:
             trigger = evolution_detail['evolution_details'][0]['trigger']['name']
             level = evolution_detail['evolution_details'][0].get('min_level')
 
-            # Check if evolution_details[0] exists before accessing 'item'
+            # 'item' is present but null when the evolution doesn't need one
             if evolution_detail['evolution_details'][0]:
-                item = evolution_detail['evolution_details'][0].get('item', {}).get('name')
+                item = (evolution_detail['evolution_details'][0].get('item') or {}).get('name')
             else:
                 item = None  # Set item to None if it doesn't exist
 
@@ -413,32 +1388,113 @@ class PokemonDataManager:
     def insert_evolution(self, evolution):
         """Inserts a new evolution into the evolutions table."""
         sql = """
-                    INSERT INTO evolutions (pokemon_id, evolves_to_id, trigger, level, item)
+                    INSERT OR IGNORE INTO evolutions (pokemon_id, evolves_to_id, trigger, level, item)
                     VALUES (?, ?, ?, ?, ?)
         """
         try:
-            cur = self.conn.cursor()
-            cur.execute(sql, evolution)
-            self.conn.commit()
+            with self.connections.writer() as conn:
+                conn.execute(sql, evolution)
             logging.info(f"Inserted Evolution: {evolution[0]} -> {evolution[1]}")
         except sqlite3.Error as e:
             logging.error(f"Error inserting evolution: {e}")
 
+    def insert_evolutions_many(self, evolutions, batch_size=None, update_existing=False):
+        """Inserts many evolutions in one transaction per batch.
+
+        Edges already stored are skipped, or updated when ``update_existing`` is True.
+        """
+        on_conflict = ("UPDATE SET trigger = excluded.trigger, level = excluded.level, item = excluded.item"
+                       if update_existing else "NOTHING")
+        sql = f"""
+                    INSERT INTO evolutions (pokemon_id, evolves_to_id, trigger, level, item)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (pokemon_id, evolves_to_id) DO {on_conflict}
+        """
+        try:
+            inserted = self._executemany_in_batches(sql, evolutions, batch_size)
+            logging.info(f"Inserted {inserted} evolutions")
+            return inserted
+        except sqlite3.Error as e:
+            logging.error(f"Error inserting evolution batch: {e}")
+            return 0
+
     def populate_evolutions_table(self):
-        """Populates the database with evolution data for all Pokemon."""
-        all_pokemon = self.get_all_pokemon()
-        for pokemon in all_pokemon:
+        """Populates the database with evolution data for all Pokemon.
+
+        Each evolution chain is fetched once and covers every Pokémon in it, so
+        the other members of a family are skipped, as are Pokémon whose
+        evolutions were stored by an earlier run.
+        """
+        if self.is_resource_synced("evolution"):
+            logging.info("Evolutions already fully synced, nothing to populate.")
+            return
+
+        done_ids = self.get_synced_keys("evolution", "entity")
+        all_fetched = True
+        evolutions = []
+        processed_ids = []
+        chain_ids = []
+        family_member_ids = []
+        for pokemon in self.get_all_pokemon():
             pokemon_id = pokemon[0]
-            evolution_data = self.fetch_evolution_data(pokemon_id)
-            for evolution in evolution_data:
-                self.insert_evolution(evolution)
-            time.sleep(0.2)
+            if str(pokemon_id) in done_ids:
+                continue
+            evolution_chain_url = self.get_evolution_chain_url(pokemon_id)
+            if evolution_chain_url is None and self.has_no_evolution_chain(pokemon_id):
+                processed_ids.append(pokemon_id)  # Recorded as done so later runs don't ask again
+                continue
+            chain = self.fetch_evolution_chain(evolution_chain_url) if evolution_chain_url else None
+            if chain is None:
+                all_fetched = False
+                continue
+            chain_evolutions, member_ids = chain
+            evolutions.extend(chain_evolutions)
+            processed_ids.append(pokemon_id)
+            processed_ids.extend(member_ids)
+            family_member_ids.extend(member_ids)
+            chain_ids.append(int(evolution_chain_url.split('/')[-2]))
+            done_ids.update(str(member_id) for member_id in member_ids)
+            if len(evolutions) >= config.DB_WRITE_BATCH_SIZE:
+                self._write_evolutions(evolutions, processed_ids, chain_ids, family_member_ids)
+                evolutions, processed_ids, chain_ids, family_member_ids = [], [], [], []
+        self._write_evolutions(evolutions, processed_ids, chain_ids, family_member_ids)
+
+        # Only complete once every Pokémon is stored, or later additions would be skipped
+        if all_fetched and self.is_resource_synced("pokemon"):
+            self.mark_synced("evolution", "resource", ["complete"])
+
+    def _write_evolutions(self, evolutions, pokemon_ids, chain_ids=(), member_ids=(), update_existing=False):
+        """Writes a batch of whole evolution chains, their family rows, and the sync state."""
+        written = self.insert_evolutions_many(evolutions, update_existing=update_existing)
+        self.insert_evolution_families_many(self.build_evolution_families(evolutions, member_ids))
+        self.mark_synced("evolution", "entity", pokemon_ids)
+        self.mark_synced("evolution-chain", "entity", chain_ids)
+        return written
+
+    def _ingest_evolution_chains(self, evolution_chain_urls, update_existing=False, refetch=False):
+        """Fetches the given evolution chains and writes their edges. Returns the number of chains stored.
+
+        Edges already stored are updated when ``update_existing`` is True. With
+        ``refetch``, chains parsed earlier in this process are requested again.
+        """
+        evolutions, member_ids, chain_ids = [], [], []
+        for evolution_chain_url in dict.fromkeys(evolution_chain_urls):
+            if refetch:
+                self._evolution_chains.pop(evolution_chain_url, None)
+            chain = self.fetch_evolution_chain(evolution_chain_url)
+            if chain is None:
+                continue
+            evolutions.extend(chain[0])
+            member_ids.extend(chain[1])
+            chain_ids.append(int(evolution_chain_url.split('/')[-2]))
+        self._write_evolutions(evolutions, member_ids, chain_ids, member_ids, update_existing=update_existing)
+        return len(chain_ids)
 
     # Add other methods as needed for fetching/filtering berries and evolutions
     def get_all_berries(self, search_term=None):
         """Fetches all berries from the database, optionally filtered by search_term."""
         try:
-            cursor = self.conn.cursor()
+            cursor = self.connections.reader().cursor()
             if search_term:
                 cursor.execute("SELECT * FROM berries WHERE name LIKE ? ORDER BY id", ('%' + search_term + '%',))
             else:
@@ -449,40 +1505,74 @@ class PokemonDataManager:
             return []
 
     def get_berry_by_id(self, berry_id):
-        """Fetches a berry by its ID from the database."""
+        """Fetches a berry by its ID, from the record cache or the database."""
+        key = ("berry", berry_id)
+        berry = self.record_cache.get(key)
+        if berry is not None:
+            return berry
+        generation = self.record_cache.generation(key)
         try:
-            cursor = self.conn.cursor()
+            cursor = self.connections.reader().cursor()
             cursor.execute("SELECT * FROM berries WHERE id = ?", (berry_id,))
-            return cursor.fetchone()
+            berry = cursor.fetchone()
+            if berry is not None:
+                self.record_cache.put(key, berry, generation)
+            return berry
         except sqlite3.Error as e:
             logging.error(f"Error fetching berry by ID {berry_id}: {e}")
             return None
 
-    def get_evolution_chain_for_pokemon(self, pokemon_id):
-        """Fetches the evolution chain for a given Pokemon from the database."""
+    def get_evolution_family(self, pokemon_id):
+        """Fetches the whole evolution family of a Pokemon, earlier and later stages included.
+
+        Returns EvolutionFamilyMember tuples ordered by stage, or an empty list if
+        the Pokémon has no family stored. One query: the member index gives the
+        family id, and the family's rows are a single primary-key range. Results
+        are kept in the record cache.
+        """
+        key = ("family", pokemon_id)
+        family = self.record_cache.get(key)
+        if family is not None:
+            return list(family)
+        generation = self.record_cache.generation(key)
         try:
-            cursor = self.conn.cursor()
+            cursor = self.connections.reader().cursor()
             cursor.execute("""
-                WITH RECURSIVE evolution_chain(pokemon_id, evolves_to_id, trigger, level, item) AS (
-                    SELECT pokemon_id, evolves_to_id, trigger, level, item
-                    FROM evolutions
-                    WHERE pokemon_id = ?
-                    UNION ALL
-                    SELECT e.pokemon_id, e.evolves_to_id, e.trigger, e.level, e.item
-                    FROM evolutions e
-                    JOIN evolution_chain ec ON e.pokemon_id = ec.evolves_to_id
-                )
-                SELECT * FROM evolution_chain;
+                SELECT f.pokemon_id, p.name, f.stage, f.parent_id, f.trigger, f.level, f.item
+                FROM evolution_families m
+                JOIN evolution_families f ON f.family_id = m.family_id
+                LEFT JOIN pokemon p ON p.id = f.pokemon_id
+                WHERE m.pokemon_id = ?
+                ORDER BY f.stage, f.pokemon_id
             """, (pokemon_id,))
-            return cursor.fetchall()
+            family = tuple(map(EvolutionFamilyMember._make, cursor.fetchall()))
+            self.record_cache.put(key, family, generation)
+            return list(family)
         except sqlite3.Error as e:
-            logging.error(f"Error fetching evolution chain for Pokemon {pokemon_id}: {e}")
+            logging.error(f"Error fetching evolution family for Pokemon {pokemon_id}: {e}")
             return []
 
+    def get_evolution_chain_for_pokemon(self, pokemon_id):
+        """Fetches the evolution chain for a given Pokemon from the database.
+
+        Returns (pokemon_id, evolves_to_id, trigger, level, item) edges for the
+        Pokémon's whole family, including the stages before it.
+        """
+        return [
+            (member.parent_id, member.pokemon_id, member.trigger, member.level, member.item)
+            for member in self.get_evolution_family(pokemon_id)
+            if member.parent_id is not None
+        ]
+
 
 if __name__ == '__main__':
-    data_manager = PokemonDataManager()
-    data_manager.populate_database()
-    data_manager.populate_berries_table()
-    data_manager.populate_evolutions_table()
+    data_manager = PokemonDataManager(profile="ingest")
+    if len(sys.argv) > 1 and sys.argv[1] == "sync":
+        data_manager.sync()
+    elif len(sys.argv) > 1 and sys.argv[1] == "atlas":
+        print(f"Packed {data_manager.build_sprite_atlas()} icons into {config.SPRITE_ATLAS_FILE}")
+    else:
+        data_manager.populate_database(download_sprites=True)
+        data_manager.populate_berries_table()
+        data_manager.populate_evolutions_table()
     data_manager.close_connection()
@@ -0,0 +1,180 @@
+"""Builds pokedex.db from an offline PokeAPI data dump instead of live HTTP.
+
+Supported dump formats:
+
+* A directory in the PokeAPI ``api-data`` layout, e.g.
+  ``<dump>/api/v2/pokemon/1/index.json`` (``<resource>/<id>.json`` also works).
+* A tar archive (``.tar``, ``.tar.gz``, ``.tgz``, ``.tar.bz2``, ``.tar.xz``) of
+  that layout.
+* An NDJSON file (``.ndjson`` / ``.jsonl``, optionally ``.gz``) with one
+  ``{"url": "<PokeAPI url>", "data": {...}}`` object per line.
+
+Usage: python dump_importer.py <dump path>
+"""
+import gzip
+import json
+import logging
+import os
+import sys
+import tarfile
+import time
+
+import config
+from data_manager import PokemonDataManager
+
+IMPORTED_RESOURCES = ("pokemon", "pokemon-species", "evolution-chain", "berry")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl", ".ndjson.gz", ".jsonl.gz")
+
+
+def _resource_from_path(path):
+    """Returns (resource, id) for a dump path such as api/v2/pokemon/25/index.json, or None."""
+    parts = [part for part in path.replace("\\", "/").split("/") if part]
+    if not parts or not parts[-1].endswith(".json"):
+        return None
+    if parts[-1] == "index.json":
+        parts = parts[:-1]
+    else:
+        parts[-1] = parts[-1][:-len(".json")]
+    if len(parts) < 2 or not parts[-1].isdigit():
+        return None
+    return parts[-2], int(parts[-1])
+
+
+def _iter_directory(root, resources):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            located = _resource_from_path(os.path.relpath(path, root))
+            if located and located[0] in resources:
+                with open(path, encoding="utf-8") as f:
+                    yield located[0], located[1], json.load(f)
+
+
+def _iter_tar(archive_path, resources):
+    # Stream mode reads the archive sequentially without building a member index
+    with tarfile.open(archive_path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            located = _resource_from_path(member.name)
+            if located and located[0] in resources:
+                yield located[0], located[1], json.load(archive.extractfile(member))
+
+
+def _iter_ndjson(ndjson_path, resources):
+    opener = gzip.open if ndjson_path.endswith(".gz") else open
+    with opener(ndjson_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            located = _resource_from_path(record["url"].rstrip("/") + ".json")
+            if located and located[0] in resources:
+                yield located[0], located[1], record["data"]
+
+
+def iter_dump_documents(dump_path, resources=IMPORTED_RESOURCES):
+    """Yields (resource, id, document) for every document of the given resources in a dump.
+
+    Documents are read one at a time, so memory use does not grow with the size of the dump.
+    """
+    resources = set(resources)
+    if os.path.isdir(dump_path):
+        return _iter_directory(dump_path, resources)
+    if dump_path.endswith(TAR_SUFFIXES):
+        return _iter_tar(dump_path, resources)
+    if dump_path.endswith(NDJSON_SUFFIXES):
+        return _iter_ndjson(dump_path, resources)
+    raise ValueError(f"Unsupported dump format: {dump_path}")
+
+
+def _compact_species(species_data):
+    """Keeps only the parts of a species document that the pokemon rows need."""
+    flavor_text_entries = [
+        entry for entry in species_data.get('flavor_text_entries', [])
+        if entry['language']['name'] == 'en'
+    ][:1]
+    return {
+        'flavor_text_entries': flavor_text_entries,
+        'evolution_chain': species_data.get('evolution_chain'),
+    }
+
+
+def _write_evolutions(data_manager, evolutions, member_ids):
+    """Writes a batch of whole evolution chains and their evolution_families rows."""
+    data_manager.insert_evolutions_many(evolutions)
+    data_manager.insert_evolution_families_many(data_manager.build_evolution_families(evolutions, member_ids))
+
+
+def import_dump(data_manager, dump_path):
+    """Imports Pokémon, berries and evolutions from a dump into the database.
+
+    The dump is streamed twice: first species, evolution chains and berries
+    (keeping only a compact summary of each species), then the Pokémon
+    documents, which are joined with their species description. Rows are
+    written with the bulk insert methods, so the import needs no network.
+    """
+    started = time.perf_counter()
+    batch_size = config.DB_WRITE_BATCH_SIZE
+    species_by_id = {}
+    berries, evolutions, family_member_ids = [], [], []
+    chain_ids, berry_ids = [], []
+
+    for resource, document_id, document in iter_dump_documents(
+            dump_path, ("pokemon-species", "evolution-chain", "berry")):
+        if resource == "pokemon-species":
+            species_by_id[document_id] = _compact_species(document)
+        elif resource == "evolution-chain":
+            data_manager._parse_evolution_chain(document['chain'], evolutions)
+            family_member_ids.extend(data_manager._evolution_chain_members(document['chain']))
+            chain_ids.append(document_id)
+        elif resource == "berry":
+            berries.append(data_manager.parse_berry_data(document))
+            berry_ids.append(document_id)
+
+        if len(berries) >= batch_size:
+            data_manager.insert_berries_many(berries)
+            berries = []
+        if len(evolutions) >= batch_size:
+            _write_evolutions(data_manager, evolutions, family_member_ids)
+            evolutions, family_member_ids = [], []
+    data_manager.insert_berries_many(berries)
+    _write_evolutions(data_manager, evolutions, family_member_ids)
+
+    pokemon_rows, pokemon_ids = [], []
+    for _, pokemon_id, document in iter_dump_documents(dump_path, ("pokemon",)):
+        species_id = int(document['species']['url'].rstrip('/').split('/')[-1])
+        pokemon_rows.append(data_manager.parse_pokemon_data(document, species_by_id.get(species_id, {})))
+        pokemon_ids.append(pokemon_id)
+        if len(pokemon_rows) >= batch_size:
+            data_manager.insert_pokemon_many(pokemon_rows)
+            pokemon_rows = []
+    data_manager.insert_pokemon_many(pokemon_rows)
+
+    # Record what the dump covered so populate_* does not fetch it again
+    for resource, ids in (("pokemon", pokemon_ids), ("berry", berry_ids), ("evolution-chain", chain_ids)):
+        if ids:
+            data_manager.mark_synced(resource, "entity", ids)
+            data_manager.mark_synced(resource, "resource", ["complete"])
+    if chain_ids:
+        data_manager.mark_synced("evolution", "entity", species_by_id)
+        data_manager.mark_synced("evolution", "resource", ["complete"])
+
+    elapsed = time.perf_counter() - started
+    counts = (len(pokemon_ids), len(berry_ids), len(chain_ids))
+    logging.info(f"Imported {counts[0]} Pokémon, {counts[1]} berries and {counts[2]} evolution chains "
+                 f"from {dump_path} in {elapsed:.1f}s")
+    print(f"Imported {counts[0]} Pokémon, {counts[1]} berries and {counts[2]} evolution chains in {elapsed:.1f}s")
+    return counts
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python dump_importer.py <dump directory, .tar[.gz] or .ndjson[.gz]>")
+        sys.exit(1)
+    data_manager = PokemonDataManager(profile="ingest")
+    import_dump(data_manager, sys.argv[1])
+    data_manager.close_connection()
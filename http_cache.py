@@ -0,0 +1,242 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CACHE_MODES = ("off", "revalidate", "replay")
+
+
+class CacheMissError(requests.exceptions.ConnectionError):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class ResponseCache:
+    """On-disk cache of HTTP response bodies with LRU eviction.
+
+    Bodies are stored content-addressed under ``objects/`` (named by the SHA-256
+    of the body, so identical documents are stored once). A small JSON entry per
+    URL under ``entries/`` holds the validators (ETag / Last-Modified) and the
+    hash of its body. Entry modification times record recency, so the LRU order
+    survives restarts.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries_dir = os.path.join(cache_dir, "entries")
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self._lock = threading.Lock()
+        self._entries = None  # url key -> body hash, least recently used first
+        self._object_sizes = {}  # body hash -> size in bytes
+        self._object_refs = {}  # body hash -> number of entries using it
+        self.total_bytes = 0
+
+    def _ensure_loaded(self):
+        """Builds the in-memory index from the cache directory on first use."""
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        entry_files = []
+        for name in os.listdir(self.entries_dir):
+            path = os.path.join(self.entries_dir, name)
+            try:
+                entry_files.append((os.path.getmtime(path), name[:-len(".json")], path))
+            except OSError:
+                continue
+
+        for _, url_key, path in sorted(entry_files):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    body_hash = json.load(f)["body"]
+                size = os.path.getsize(self._object_path(body_hash))
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Dropping unreadable HTTP cache entry {path}: {e}")
+                self._remove_file(path)
+                continue
+            self._add_entry(url_key, body_hash, size)
+        logging.info(f"Loaded HTTP cache index: {len(self._entries)} entries, {self.total_bytes} bytes")
+
+    def _url_key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, url_key):
+        return os.path.join(self.entries_dir, f"{url_key}.json")
+
+    def _object_path(self, body_hash):
+        return os.path.join(self.objects_dir, body_hash[:2], body_hash)
+
+    def _add_entry(self, url_key, body_hash, size):
+        self._entries[url_key] = body_hash
+        if body_hash not in self._object_refs:
+            self._object_refs[body_hash] = 0
+            self._object_sizes[body_hash] = size
+            self.total_bytes += size
+        self._object_refs[body_hash] += 1
+
+    def _drop_entry(self, url_key):
+        body_hash = self._entries.pop(url_key)
+        self._object_refs[body_hash] -= 1
+        if self._object_refs[body_hash] == 0:
+            del self._object_refs[body_hash]
+            self.total_bytes -= self._object_sizes.pop(body_hash)
+            self._remove_file(self._object_path(body_hash))
+
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """Returns the cached entry for ``url`` (with its body), or None."""
+        with self._lock:
+            self._ensure_loaded()
+            url_key = self._url_key(url)
+            if url_key not in self._entries:
+                return None
+            entry_path = self._entry_path(url_key)
+            try:
+                with open(entry_path, encoding="utf-8") as f:
+                    entry = json.load(f)
+                with open(self._object_path(entry["body"]), "rb") as f:
+                    entry["content"] = f.read()
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"HTTP cache entry for {url} is unreadable: {e}")
+                self._drop_entry(url_key)
+                self._remove_file(entry_path)
+                return None
+            self._entries.move_to_end(url_key)
+            try:
+                os.utime(entry_path)  # Persist the recency for the next start
+            except OSError:
+                pass
+            return entry
+
+    def put(self, url, content, headers):
+        """Stores a response body and its validators, evicting old entries if over budget."""
+        body_hash = hashlib.sha256(content).hexdigest()
+        entry = {
+            "url": url,
+            "body": body_hash,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "content_type": headers.get("Content-Type"),
+            "stored_at": time.time(),
+        }
+        with self._lock:
+            self._ensure_loaded()
+            try:
+                object_path = self._object_path(body_hash)
+                if not os.path.exists(object_path):
+                    self._write_atomic(object_path, content)
+                url_key = self._url_key(url)
+                self._write_atomic(self._entry_path(url_key), json.dumps(entry).encode("utf-8"))
+            except OSError as e:
+                logging.error(f"Error writing HTTP cache entry for {url}: {e}")
+                return
+            if self._entries.get(url_key) == body_hash:
+                self._entries.move_to_end(url_key)  # Same document, only the validators changed
+                return
+            if url_key in self._entries:
+                self._drop_entry(url_key)
+            self._add_entry(url_key, body_hash, len(content))
+            self._evict()
+
+    def touch(self, url):
+        """Marks ``url`` as recently used after a successful revalidation."""
+        with self._lock:
+            self._ensure_loaded()
+            url_key = self._url_key(url)
+            if url_key in self._entries:
+                self._entries.move_to_end(url_key)
+                try:
+                    os.utime(self._entry_path(url_key))
+                except OSError:
+                    pass
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            url_key = next(iter(self._entries))
+            self._drop_entry(url_key)
+            self._remove_file(self._entry_path(url_key))
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GET requests from a ResponseCache.
+
+    Modes:
+        "off":        no caching.
+        "revalidate": cached responses are revalidated with If-None-Match /
+                      If-Modified-Since; a 304 is served from the cache.
+        "replay":     responses come only from the cache and the network is
+                      never used; a miss raises CacheMissError.
+    """
+
+    def __init__(self, cache, mode="revalidate", **kwargs):
+        super().__init__(**kwargs)
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown HTTP cache mode: {mode}")
+        self.cache = cache
+        self.mode = mode
+
+    def send(self, request, **kwargs):
+        if self.mode == "off" or request.method != "GET":
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if self.mode == "replay":
+            if entry is None:
+                raise CacheMissError(f"No cached response for {request.url} (replay mode)", request=request)
+            return self._build_response(request, entry)
+
+        if entry is not None:
+            if entry.get("etag"):
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            # Drain the empty body so the connection goes back to the pool instead of being closed
+            response.content
+            response.close()
+            self.cache.touch(request.url)
+            return self._build_response(request, entry)
+        if response.status_code == 200:
+            self.cache.put(request.url, response.content, response.headers)
+        return response
+
+    def _build_response(self, request, entry):
+        """Builds a 200 response from a cache entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response._content = entry["content"]
+        response.headers = CaseInsensitiveDict({"X-From-Cache": "1"})
+        if entry.get("content_type"):
+            response.headers["Content-Type"] = entry["content_type"]
+        if entry.get("etag"):
+            response.headers["ETag"] = entry["etag"]
+        return response
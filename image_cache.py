@@ -0,0 +1,89 @@
+import os
+
+from PIL import Image, ImageTk
+
+import config
+from lru_cache import LRUCache
+
+
+def image_nbytes(image):
+    """Returns the memory a decoded PIL image or a Tk photo image takes, in bytes."""
+    if isinstance(image, Image.Image):
+        return image.width * image.height * len(image.getbands())
+    return image.width() * image.height() * 4  # Tk keeps photo images as 32-bit pixels
+
+
+class ImageCache:
+    """Byte-budgeted LRUs of decoded PIL images and of the Tk photo images made from them.
+
+    Entries are keyed by (source, size, resample mode). ``source`` is a file path,
+    or any hashable key together with a ``loader`` that returns the PIL image.
+    With ``size`` the image is resized once and the resized copy is cached.
+
+    The two kinds live in separate caches. get_image and cached_image only touch
+    the decoded images and may be called from any thread. The photo image methods
+    and invalidate must only be called on the Tk thread, so a photo image is never
+    evicted, and so deleted from Tk, on a worker thread.
+    """
+
+    def __init__(self, max_bytes, max_photo_bytes):
+        self._images = LRUCache(max_bytes, sizeof=image_nbytes)
+        self._photos = LRUCache(max_photo_bytes, sizeof=image_nbytes)
+
+    def _key(self, source, size, resample):
+        return source, tuple(size) if size else None, int(resample)
+
+    def cached_image(self, source, size=None, resample=Image.Resampling.LANCZOS):
+        """Returns the PIL image if it is cached, without any IO or decoding."""
+        return self._images.get(self._key(source, size, resample))
+
+    def cached_photo(self, source, size=None, resample=Image.Resampling.LANCZOS):
+        """Returns the Tk photo image if it is cached. Tk thread only."""
+        return self._photos.get(self._key(source, size, resample))
+
+    def get_image(self, source, size=None, resample=Image.Resampling.LANCZOS, loader=None):
+        """Returns the decoded (and resized) image, loading it on a miss. Returns None if it cannot be loaded."""
+        key = self._key(source, size, resample)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+        if loader is None and not isinstance(source, (str, os.PathLike)):
+            raise TypeError(f"Image source {source!r} is not a path and no loader was given")
+        if loader is not None:
+            image = loader()
+        else:
+            with Image.open(source) as opened:
+                opened.load()
+                image = opened
+        if image is None:
+            return None
+        if size and image.size != tuple(size):
+            image = image.resize(size, resample)
+        self._images.put(key, image)
+        return image
+
+    def get_photo(self, source, size=None, resample=Image.Resampling.LANCZOS, loader=None):
+        """Returns a Tk photo image of the (resized) image, reusing a cached one. Tk thread only."""
+        key = self._key(source, size, resample)
+        photo = self._photos.get(key)
+        if photo is not None:
+            return photo
+        image = self.get_image(source, size, resample, loader)
+        if image is None:
+            return None
+        photo = ImageTk.PhotoImage(image)
+        self._photos.put(key, photo)
+        return photo
+
+    def invalidate(self, source):
+        """Drops every cached variant of ``source``, decoded and photo. Tk thread only."""
+        self._images.invalidate_where(lambda key, value: key[0] == source)
+        self._photos.invalidate_where(lambda key, value: key[0] == source)
+
+    def stats(self):
+        """Returns the counters of both caches: entries, bytes used, capacity, hits, misses, evictions and hit rate."""
+        return {"images": self._images.stats(), "photos": self._photos.stats()}
+
+
+# Shared by the data manager (sprites) and the views (sprites, icons, logo)
+images = ImageCache(config.IMAGE_CACHE_BYTES, config.PHOTO_CACHE_BYTES)
@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache with hit/miss/eviction counters.
+
+    ``capacity`` is measured with ``sizeof(value)``; by default every entry
+    counts as 1, so the capacity is an entry count.
+
+    For read-through use from several threads, take ``generation(key)`` on a
+    miss, before loading the value, and pass it to ``put``: if the key was
+    invalidated while the value was being loaded, the put is skipped rather
+    than caching a value the write has already made stale.
+    """
+
+    def __init__(self, capacity, sizeof=None):
+        self.capacity = capacity
+        self.sizeof = sizeof or (lambda value: 1)
+        self._entries = OrderedDict()  # key -> (value, size), least recently used first
+        self._lock = threading.Lock()
+        self._generations = {}  # key -> number of times it was invalidated
+        self._epoch = 0  # Bumped by invalidate_where and clear, which can't name the keys they cover
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value for ``key`` (marking it recently used), or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def generation(self, key):
+        """Returns a token that changes whenever ``key`` is invalidated, for use with ``put``."""
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def put(self, key, value, generation=None):
+        """Caches ``value`` under ``key``, evicting least recently used entries to stay within capacity.
+
+        With ``generation`` (from ``generation(key)``), nothing is cached if the
+        key has been invalidated since. Returns True if the value was cached.
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(key, 0)):
+                return False  # Invalidated while the value was being loaded
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            if size > self.capacity:
+                return False  # Larger than the whole cache; never worth keeping
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.capacity:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key):
+        """Drops ``key`` from the cache if present."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def invalidate_where(self, predicate):
+        """Drops every entry for which ``predicate(key, value)`` is true."""
+        with self._lock:
+            self._epoch += 1
+            for key in [key for key, (value, _) in self._entries.items() if predicate(key, value)]:
+                self.size -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Empties the cache; the counters are kept."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self.size = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """Returns the cache counters and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,89 @@
+import logging
+import threading
+from collections import deque
+
+
+class Prefetcher:
+    """Warms the record and sprite caches for Pokémon near the list selection, on a background thread.
+
+    ``request(ids)`` replaces whatever is still queued, so work for entries the
+    selection has moved away from is cancelled rather than finished. The queue
+    holds at most ``max_queue`` ids. Sprites are read from the local sprite
+    store only, unless ``download_sprites`` allows network downloads. The
+    byte-budgeted shared image cache bounds the memory used.
+    """
+
+    def __init__(self, data_manager, max_queue=16, download_sprites=False):
+        self.data_manager = data_manager
+        self.max_queue = max_queue
+        self.download_sprites = download_sprites
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        # Counters
+        self.warmed = 0
+        self.cancelled = 0  # Queued ids dropped because the selection moved on
+        self.failed = 0
+
+    def start(self):
+        """Starts the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="pokedex-prefetch", daemon=True)
+            self._thread.start()
+
+    def request(self, pokemon_ids):
+        """Queues the given ids (most wanted first) in place of any pending work."""
+        with self._condition:
+            self.cancelled += len(self._pending)
+            self._pending = deque(list(dict.fromkeys(pokemon_ids))[:self.max_queue])
+            self._condition.notify()
+
+    def cancel(self):
+        """Drops all pending work."""
+        self.request([])
+
+    def stop(self, timeout=1.0):
+        """Stops the worker thread after the item it is working on."""
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and not self._stopped:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+                    pokemon_id = self._pending.popleft()
+                self._warm(pokemon_id)
+        finally:
+            self.data_manager.connections.release_reader()
+
+    def _warm(self, pokemon_id):
+        try:
+            if self.data_manager.get_pokemon_by_id(pokemon_id) is None:
+                return
+            self.data_manager.get_evolution_family(pokemon_id)
+            self.data_manager.get_sprite(pokemon_id, "front", download=self.download_sprites)
+            self.warmed += 1
+        except Exception as e:
+            self.failed += 1
+            logging.error(f"Error prefetching Pokémon {pokemon_id}: {e}")
+
+    def stats(self):
+        """Returns the prefetcher counters."""
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "warmed": self.warmed,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+            }
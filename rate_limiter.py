@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from requests.adapters import HTTPAdapter
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate adapts to the server's 429 responses.
+
+    Every request takes one token. Each successful response raises the rate by
+    ``increase`` requests/s, up to ``max_rate``. A 429 halves it (down to
+    ``min_rate``) and pauses all callers for the Retry-After period.
+    """
+
+    def __init__(self, rate, burst, min_rate, max_rate, increase=0.1):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.requests = 0
+        self.throttled = 0  # Requests that had to wait for a token
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0  # 429 responses seen
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    if waited:
+                        self.throttled += 1
+                        self.throttled_seconds += waited
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def on_success(self):
+        """Additively raises the rate after a response that was not rate limited."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self, retry_after=None):
+        """Halves the rate and pauses every caller after a 429 response."""
+        with self._lock:
+            self.rate_limited += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            logging.warning(f"Rate limited by the server, pausing {pause:.1f}s at {self.rate:.2f} requests/s")
+
+    def stats(self):
+        """Returns the limiter counters."""
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "throttled_seconds": round(self.throttled_seconds, 2),
+                "rate_limited": self.rate_limited,
+            }
+
+
+def parse_retry_after(value):
+    """Returns the delay in seconds from a Retry-After header (seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that sends every request through a shared AdaptiveRateLimiter.
+
+    429 responses are retried here (up to ``max_rate_limit_retries`` times) after
+    the limiter has backed off, instead of in urllib3's Retry.
+    """
+
+    def __init__(self, limiter=None, max_rate_limit_retries=5, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+    def send(self, request, **kwargs):
+        if self.limiter is None:
+            return super().send(request, **kwargs)
+
+        for attempt in range(self.max_rate_limit_retries + 1):
+            self.limiter.acquire()
+            response = super().send(request, **kwargs)
+            if response.status_code != 429:
+                self.limiter.on_success()
+                return response
+            if attempt < self.max_rate_limit_retries:
+                # Drain and close the 429 so its connection goes back to the pool for the retry;
+                # the last one is returned to the caller as it is
+                response.content
+                response.close()
+            self.limiter.on_rate_limited(parse_retry_after(response.headers.get("Retry-After")))
+        return response
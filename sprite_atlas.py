@@ -0,0 +1,99 @@
+"""Packs small sprite thumbnails into one memory-mapped atlas file.
+
+Layout (little endian):
+
+* header: magic ``PKATLAS1``, thumbnail width and height (uint16), entry count (uint32)
+* index: one (pokemon id uint32, byte offset uint64) pair per thumbnail, sorted by id
+* data: the thumbnails as raw RGBA pixels, ``width * height * 4`` bytes each
+
+A thumbnail is read by slicing the mapped file at its offset, with no file
+open and no PNG decode per image.
+"""
+import logging
+import mmap
+import os
+import struct
+
+from PIL import Image
+
+ATLAS_MAGIC = b"PKATLAS1"
+HEADER = struct.Struct("<8sHHI")
+INDEX_ENTRY = struct.Struct("<IQ")
+
+
+def build_sprite_atlas(sprite_store, pokemon_ids, atlas_path, size, variant="front"):
+    """Writes an atlas of ``size`` thumbnails for every given Pokémon that has a stored sprite.
+
+    Returns the number of thumbnails written.
+    """
+    thumbnails = []
+    for pokemon_id in sorted(set(pokemon_ids)):
+        image = sprite_store.load(pokemon_id, variant)
+        if image is not None:
+            thumbnails.append((pokemon_id, image.convert("RGBA").resize(size, Image.Resampling.LANCZOS).tobytes()))
+
+    data_offset = HEADER.size + INDEX_ENTRY.size * len(thumbnails)
+    thumbnail_bytes = size[0] * size[1] * 4
+    os.makedirs(os.path.dirname(atlas_path) or ".", exist_ok=True)
+    tmp_path = f"{atlas_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(ATLAS_MAGIC, size[0], size[1], len(thumbnails)))
+        for position, (pokemon_id, _) in enumerate(thumbnails):
+            f.write(INDEX_ENTRY.pack(pokemon_id, data_offset + position * thumbnail_bytes))
+        for _, pixels in thumbnails:
+            f.write(pixels)
+    os.replace(tmp_path, atlas_path)
+    logging.info(f"Built sprite atlas {atlas_path} with {len(thumbnails)} thumbnails")
+    return len(thumbnails)
+
+
+class SpriteAtlas:
+    """Read-only, memory-mapped view of an atlas written by build_sprite_atlas."""
+
+    def __init__(self, atlas_path):
+        self.path = atlas_path
+        self._file = open(atlas_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, width, height, count = HEADER.unpack_from(self._mmap, 0)
+            if magic != ATLAS_MAGIC:
+                raise ValueError(f"Not a sprite atlas: {atlas_path}")
+            self.size = (width, height)
+            self.thumbnail_bytes = width * height * 4
+            self._offsets = dict(
+                INDEX_ENTRY.unpack_from(self._mmap, HEADER.size + i * INDEX_ENTRY.size) for i in range(count)
+            )
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    @classmethod
+    def open(cls, atlas_path):
+        """Returns the atlas at ``atlas_path``, or None if it is missing or unreadable."""
+        try:
+            return cls(atlas_path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logging.error(f"Unreadable sprite atlas {atlas_path}: {e}")
+            return None
+
+    def __contains__(self, pokemon_id):
+        return pokemon_id in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get_image(self, pokemon_id):
+        """Returns the thumbnail of a Pokémon as an RGBA PIL image, or None if the atlas has none."""
+        offset = self._offsets.get(pokemon_id)
+        if offset is None:
+            return None
+        pixels = self._mmap[offset:offset + self.thumbnail_bytes]
+        return Image.frombuffer("RGBA", self.size, pixels, "raw", "RGBA", 0, 1)
+
+    def close(self):
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
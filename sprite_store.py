@@ -0,0 +1,87 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image
+
+SPRITE_VARIANTS = ("front", "back")
+
+
+class SpriteStore:
+    """Local store of Pokémon sprites, already resized for display.
+
+    Sprites are PNG files under ``<root>/<variant>/<pokemon id>.png``, resized
+    to ``size`` once when they are downloaded, so showing one is a small file
+    read and PNG decode with no network and no resampling.
+    """
+
+    def __init__(self, root, size, session=None, timeout=10):
+        self.root = root
+        self.size = tuple(size)
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def path(self, pokemon_id, variant="front"):
+        if variant not in SPRITE_VARIANTS:
+            raise ValueError(f"Unknown sprite variant: {variant}")
+        return os.path.join(self.root, variant, f"{int(pokemon_id)}.png")
+
+    def has(self, pokemon_id, variant="front"):
+        return os.path.exists(self.path(pokemon_id, variant))
+
+    def load(self, pokemon_id, variant="front"):
+        """Returns the stored sprite as a PIL image, or None if it has not been downloaded."""
+        try:
+            with Image.open(self.path(pokemon_id, variant)) as image:
+                image.load()
+                return image
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.error(f"Unreadable sprite for Pokémon {pokemon_id} ({variant}): {e}")
+            return None
+
+    def download(self, pokemon_id, variant, sprite_url):
+        """Downloads a sprite, resizes it and stores it. Returns True on success."""
+        try:
+            response = self.session.get(sprite_url, timeout=self.timeout)
+            response.raise_for_status()
+            with Image.open(io.BytesIO(response.content)) as image:
+                thumbnail = image.convert("RGBA").resize(self.size, Image.Resampling.LANCZOS)
+        except (requests.exceptions.RequestException, OSError) as e:
+            logging.error(f"Error downloading sprite for Pokémon {pokemon_id} ({variant}): {e}")
+            return False
+
+        path = self.path(pokemon_id, variant)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            thumbnail.save(tmp_path, format="PNG", optimize=True)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error(f"Error storing sprite for Pokémon {pokemon_id} ({variant}): {e}")
+            return False
+        return True
+
+    def get(self, pokemon_id, variant="front", sprite_url=None):
+        """Returns the sprite from the store, downloading it first if it is missing and a URL is given."""
+        image = self.load(pokemon_id, variant)
+        if image is None and sprite_url and self.download(pokemon_id, variant, sprite_url):
+            image = self.load(pokemon_id, variant)
+        return image
+
+    def download_all(self, sprites, workers=4):
+        """Downloads every (pokemon_id, variant, sprite_url) that is not stored yet, in parallel.
+
+        Returns the number of sprites downloaded.
+        """
+        missing = [sprite for sprite in sprites if sprite[2] and not self.has(sprite[0], sprite[1])]
+        if not missing:
+            return 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            downloaded = sum(executor.map(lambda sprite: self.download(*sprite), missing))
+        logging.info(f"Downloaded {downloaded} of {len(missing)} missing sprites")
+        return downloaded
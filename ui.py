@@ -1,6 +1,8 @@
 import tkinter as tk
 from views import menu_view, pokedex_view, detail_view, favourites_view
 from data_manager import PokemonDataManager
+from prefetcher import Prefetcher
+import config
 import logging
 
 
@@ -12,6 +14,17 @@ class PokedexApp:
         # Initialize the data manager
         self.data_manager = PokemonDataManager()
 
+        # Warms records and sprites around the PokedexView selection in the background
+        self.prefetcher = Prefetcher(
+            self.data_manager,
+            max_queue=config.PREFETCH_QUEUE_SIZE,
+            download_sprites=config.PREFETCH_DOWNLOAD_SPRITES,
+        )
+        self.prefetcher.start()
+
+        # Stop the background work and close the database when the window is closed
+        self.master.protocol("WM_DELETE_WINDOW", self.shutdown)
+
         # Store view instances
         self.views = {}
         self.current_view = None
@@ -28,6 +41,10 @@ class PokedexApp:
             self.current_view.pack_forget()
             self.current_view.unbind_keys()  # Unbind keys from the current view
 
+        # A DetailView shows one Pokémon, so it is rebuilt for every Pokémon opened
+        if view_name == "DetailView" and view_name in self.views:
+            self.views.pop(view_name).destroy()
+
         # Create the view instance if it doesn't exist
         if view_name not in self.views:
             if view_name == "MenuView":
@@ -46,3 +63,11 @@ class PokedexApp:
         self.current_view = self.views[view_name]
         self.current_view.pack(fill=tk.BOTH, expand=True)
         self.current_view.bind_keys()  # Bind keys for the new view
+
+    def shutdown(self):
+        """Stops the background workers, closes the database and destroys the main window."""
+        logging.debug("Shutting down PokedexApp")
+        self.prefetcher.stop()
+        detail_view.sprite_loader.shutdown(wait=True, cancel_futures=True)
+        self.data_manager.close_connection()  # Also runs PRAGMA optimize when the profile asks for it
+        self.master.destroy()
@@ -1,9 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
-import io
-import requests
+from concurrent.futures import ThreadPoolExecutor
+import config
 import logging
+from image_cache import images
+
+# Reads, decodes and resizes sprites off the Tk thread; one worker, so requests run in order
+sprite_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sprite-loader")
+
+
+def load_sprite(data_manager, pokemon_id):
+    """Returns a Pokémon's front sprite as a PIL image of config.SPRITE_SIZE, or None. Runs on sprite_loader.
+
+    get_sprite reads (or downloads), decodes and resizes it into the shared image cache.
+    """
+    return data_manager.get_sprite(pokemon_id, "front")
 
 
 class DetailView(tk.Frame):
@@ -15,6 +26,8 @@ class DetailView(tk.Frame):
         self.data_manager = data_manager
         self.pokemon_id = pokemon_id
         self.app = app  # Store the PokedexApp instance
+        self.sprite_future = None
+        self.sprite_poll_id = None
 
         # Fetch Pokemon data
         self.pokemon_data = self.data_manager.get_pokemon_by_id(self.pokemon_id)
@@ -26,12 +39,6 @@ class DetailView(tk.Frame):
         # Load and display the sprite
         self.load_and_display_sprite()
 
-        # Bind navigation keys
-        self.master.bind("<Up>", self.handle_up)
-        self.master.bind("<Down>", self.handle_down)
-        self.master.bind("<Right>", self.handle_right)
-        self.master.bind("<BackSpace>", self.handle_back)
-
         self.current_detail_index = 0  # Start at the top of the details
 
     def create_widgets(self):
@@ -79,6 +86,17 @@ class DetailView(tk.Frame):
         self.description_label.pack(pady=10)
         self.stats_labels.append(self.description_label)  # Add description label for navigation
 
+        # --- Evolutions ---
+        family = self.data_manager.get_evolution_family(self.pokemon_id)
+        if len(family) > 1:
+            stages = {}
+            for member in family:
+                stages.setdefault(member.stage, []).append((member.name or f"#{member.pokemon_id}").capitalize())
+            evolution_text = " → ".join(" / ".join(names) for _, names in sorted(stages.items()))
+            self.evolution_label = ttk.Label(self.content_frame, text=f"Evolutions:\n{evolution_text}", wraplength=200)
+            self.evolution_label.pack(pady=(0, 10))
+            self.stats_labels.append(self.evolution_label)
+
         # Configure the Canvas to update the scroll region
         self.content_frame.bind("<Configure>", self.on_frame_configure)
 
@@ -87,21 +105,65 @@ class DetailView(tk.Frame):
         self.detail_canvas.configure(scrollregion=self.detail_canvas.bbox("all"))
 
     def load_and_display_sprite(self):
-        """Loads and displays the Pokemon sprite."""
+        """Shows the Pokemon sprite, loading it on the sprite_loader thread.
+
+        A sprite already in the image cache is shown at once. Otherwise a
+        placeholder of the sprite's size is shown and _poll_sprite displays the
+        image when the worker has read, decoded and resized it.
+        """
         logging.debug("Loading and displaying sprite in DetailView")
+        if not self.pokemon_data[10]:  # sprite_front URL
+            self.sprite_label.config(text="No Sprite", bg="gray")
+            return
+        source = self.data_manager.sprite_source(self.pokemon_id, "front")
+        if images.cached_image(source, config.SPRITE_SIZE) is not None:
+            # The decoded image may be evicted before the photo is made; get_sprite reloads it then
+            self.display_sprite(images.get_photo(
+                source, config.SPRITE_SIZE, loader=lambda: self.data_manager.get_sprite(self.pokemon_id, "front")
+            ))
+            return
+
+        self.sprite_placeholder = tk.PhotoImage(width=config.SPRITE_SIZE[0], height=config.SPRITE_SIZE[1])
+        self.sprite_label.config(image=self.sprite_placeholder, text="Loading...", compound="center", bg="gray")
+        self.sprite_future = sprite_loader.submit(load_sprite, self.data_manager, self.pokemon_id)
+        self.sprite_poll_id = self.after(20, self._poll_sprite, self.sprite_future)
+
+    def _poll_sprite(self, future):
+        """Displays the sprite once its worker has finished; results for another request are dropped."""
+        if future is not self.sprite_future:
+            return  # Stale: the view has moved on
+        if not future.done():
+            self.sprite_poll_id = self.after(20, self._poll_sprite, future)
+            return
+        self.sprite_poll_id = None
+        self.sprite_future = None
         try:
-            sprite_url = self.pokemon_data[10]  # Assuming sprite URL is at index 10
-            if sprite_url:
-                response = requests.get(sprite_url)
-                response.raise_for_status()
-                sprite_image = Image.open(io.BytesIO(response.content))
-                self.sprite_photo = ImageTk.PhotoImage(sprite_image.resize((100, 100), Image.Resampling.LANCZOS))
-                self.sprite_label.config(image=self.sprite_photo, bg="white")
-            else:
-                self.sprite_label.config(text="No Sprite", bg="gray")
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error loading sprite: {e}")
-            self.sprite_label.config(text="Error", bg="gray")
+            sprite_image = future.result()
+        except Exception as e:
+            logging.error(f"Error loading sprite for Pokemon {self.pokemon_id}: {e}")
+            sprite_image = None
+        if sprite_image is None:
+            self.display_sprite(None)
+            return
+        source = self.data_manager.sprite_source(self.pokemon_id, "front")
+        self.display_sprite(images.get_photo(source, config.SPRITE_SIZE, loader=lambda: sprite_image))
+
+    def display_sprite(self, sprite_photo):
+        if sprite_photo is not None:
+            self.sprite_photo = sprite_photo  # Keep a reference; the cache may evict it
+            self.sprite_label.config(image=self.sprite_photo, text="", bg="white")
+        else:
+            self.sprite_label.config(image="", text="Error", bg="gray")
+
+    def destroy(self):
+        """Cancels a pending sprite load so its result is never shown."""
+        if self.sprite_poll_id is not None:
+            self.after_cancel(self.sprite_poll_id)
+            self.sprite_poll_id = None
+        if self.sprite_future is not None:
+            self.sprite_future.cancel()
+            self.sprite_future = None
+        super().destroy()
 
     def handle_up(self, event):
         """Handles the Up arrow key press for detail navigation."""
@@ -129,11 +191,32 @@ class DetailView(tk.Frame):
         logging.debug("Going back to PokedexView from DetailView")
         self.app.show_view("PokedexView")  # Corrected: using self.app
 
+    def bind_keys(self):
+        """Binds navigation keys to the DetailView."""
+        logging.debug("Binding navigation keys in DetailView")
+        self.master.bind("<Up>", self.handle_up)
+        self.master.bind("<Down>", self.handle_down)
+        self.master.bind("<Right>", self.handle_right)
+        self.master.bind("<BackSpace>", self.handle_back)
+
+    def unbind_keys(self):
+        """Unbinds navigation keys from the DetailView."""
+        logging.debug("Unbinding navigation keys in DetailView")
+        self.master.unbind("<Up>")
+        self.master.unbind("<Down>")
+        self.master.unbind("<Right>")
+        self.master.unbind("<BackSpace>")
+
     def toggle_favorite(self):
         """Toggles the favorite status of the Pokemon."""
         logging.debug("Toggling favorite status in DetailView")
         self.is_favorite = not self.is_favorite
-        self.data_manager.update_favorite_status(self.pokemon_id, self.is_favorite)
+        updated = self.data_manager.update_favorite_status(self.pokemon_id, self.is_favorite)
+
+        # Keep the list's row in step, so going back shows the new star and its next toggle starts from it
+        pokedex_view = self.app.views.get("PokedexView")
+        if updated is not None and pokedex_view is not None:
+            pokedex_view.patch_pokemon_row(updated)
 
         # Update the title label to reflect the favorite status
         title_label = ttk.Label(self, text=f"{self.pokemon_data[1].capitalize()} - #{self.pokemon_id} {'★' if self.is_favorite else ''}", font=("Arial", 14, "bold"))
@@ -37,10 +37,8 @@ class FavouritesView(tk.Frame):
     def load_favourites_data(self):
         """Loads favourite Pokémon data into the Treeview."""
         self.favourites_tree.delete(*self.favourites_tree.get_children())
-        pokemon_list = self.data_manager.get_all_pokemon()
-        for pokemon in pokemon_list:
-            if pokemon[13] == 1:  # Check if the Pokémon is a favourite
-                self.favourites_tree.insert("", tk.END, values=(pokemon[0], pokemon[1]))
+        for pokemon in self.data_manager.get_favourites():
+            self.favourites_tree.insert("", tk.END, values=(pokemon.id, pokemon.name))
 
     def on_pokemon_select(self, event):
         """Handles selection of a Pokémon in the Treeview."""
@@ -82,4 +80,18 @@ class FavouritesView(tk.Frame):
 
     def return_to_menu(self, event=None):
         """Returns to the main menu."""
-        self.app.show_view("MenuView")  # Use self.app to show MenuView
\ No newline at end of file
+        self.app.show_view("MenuView")  # Use self.app to show MenuView
+
+    def bind_keys(self):
+        """Binds navigation keys to the FavouritesView and refreshes the list."""
+        logging.debug("Binding navigation keys in FavouritesView")
+        self.load_favourites_data()  # Favourites may have changed since the view was created
+        self.master.bind("<Return>", self.show_pokemon_details)
+        self.master.bind("<BackSpace>", self.return_to_menu)
+        self.favourites_tree.focus_set()
+
+    def unbind_keys(self):
+        """Unbinds navigation keys from the FavouritesView."""
+        logging.debug("Unbinding navigation keys in FavouritesView")
+        self.master.unbind("<Return>")
+        self.master.unbind("<BackSpace>")
@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
 import logging
 import os
+import config
+from asset_pipeline import load_asset
+from image_cache import images
 
 
 class MenuView(tk.Frame):
@@ -27,14 +29,13 @@ class MenuView(tk.Frame):
     def create_logo(self):
         """Creates and displays the Pokedex logo."""
         logging.debug("Creating logo in MenuView")
-        logo_path = os.path.join("assets", "pokedex_logo.png")
+        logo_path = os.path.join(config.ASSETS_DIR, "pokedex_logo.png")
         try:
-            logo_img = Image.open(logo_path)
-            logging.debug(f"Opened logo image: {logo_path}")
-            logo_img = logo_img.resize((200, 80), Image.Resampling.LANCZOS)
-            logging.debug("Resized logo image to 200x80 pixels")
-            self.logo_photo = ImageTk.PhotoImage(logo_img)
-            logging.debug("Created PhotoImage from logo")
+            # The pre-scaled variant from asset_pipeline.py, converted once and shared through the image cache
+            self.logo_photo = images.get_photo(
+                logo_path, config.LOGO_SIZE, loader=lambda: load_asset(logo_path, config.LOGO_SIZE)
+            )
+            logging.debug(f"Loaded logo PhotoImage ({config.LOGO_SIZE[0]}x{config.LOGO_SIZE[1]})")
 
             self.logo_label = tk.Label(self.frame, image=self.logo_photo)
             logging.debug("Created logo label with PhotoImage")
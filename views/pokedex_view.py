@@ -3,6 +3,25 @@ from tkinter import ttk
 import logging
 import platform
 import os
+import config
+from data_manager import parse_filter_query
+from image_cache import images
+from views.virtual_list import VirtualList
+
+
+def index_by_id(rows, pokemon_id):
+    """Returns the index of the row with ``pokemon_id`` in rows sorted by id, or None.
+
+    A plain binary search: bisect's ``key`` argument needs Python 3.10.
+    """
+    low, high = 0, len(rows)
+    while low < high:
+        middle = (low + high) // 2
+        if rows[middle].id < pokemon_id:
+            low = middle + 1
+        else:
+            high = middle
+    return low if low < len(rows) and rows[low].id == pokemon_id else None
 
 
 class PokedexView(tk.Frame):
@@ -17,8 +36,11 @@ class PokedexView(tk.Frame):
         self.filtered_pokemon = []
         self.selected_index = 0
         self.favorite_toggling = False
-        self.current_offset = 0
+        self.next_cursor = None  # Continuation token for the next lazy-loaded batch
+        self.all_loaded = False
         self.batch_size = 50
+        self.filters = None  # Structured filters (type:, stat ranges) applied to the lazy-loaded list
+        self.filter_count = 0
         self.search_active = False
         self.loading_more = False
         self.search_term = tk.StringVar()
@@ -47,7 +69,11 @@ class PokedexView(tk.Frame):
         self.clear_button = ttk.Button(search_frame, text="Clear", command=self.clear_search)
         self.clear_button.pack(side=tk.LEFT)
 
-        self.pokemon_listbox = tk.Listbox(self, width=20, activestyle='none')
+        # Draws only the rows in view, with icons from the sprite atlas
+        self.pokemon_listbox = VirtualList(
+            self, format_row=self.format_pokemon_row, icon_for=self.pokemon_icon,
+            icon_size=config.SPRITE_ICON_SIZE, width=20,
+        )
         self.pokemon_listbox.pack(pady=10, fill=tk.BOTH, expand=True)
 
         # Result count label
@@ -70,15 +96,16 @@ class PokedexView(tk.Frame):
     def _load_pokemon_batch_async(self):
         """Loads a batch of Pokémon asynchronously."""
         try:
-            new_pokemon = self.data_manager.get_all_pokemon(
-                limit=self.batch_size, offset=self.current_offset
+            page = self.data_manager.get_pokemon_page(
+                after_id=self.next_cursor, limit=self.batch_size, filters=self.filters
             )
-            self.pokemon_list.extend(new_pokemon)
+            self.pokemon_list.extend(page.rows)
+            self.next_cursor = page.next_cursor
+            self.all_loaded = page.next_cursor is None
             if self.search_active:
                 self.filter_pokemon_list()
             else:
                 self.populate_listbox()
-            self.current_offset += self.batch_size
         except Exception as e:
             logging.error(f"Error loading Pokemon batch: {e}")
             # Display an error message to the user (implementation needed)
@@ -89,33 +116,48 @@ class PokedexView(tk.Frame):
             self.loading_more = False
 
     def populate_listbox(self, pokemon_list=None):
-        """Populates the listbox with the given pokemon_list or the full list if None."""
-        logging.debug("Populating listbox in PokedexView")
-        self.pokemon_listbox.delete(0, tk.END)
+        """Shows the given pokemon_list, or the full list if None, in the listbox.
 
+        The list is handed to the VirtualList as its backing rows, so only the
+        rows in view are drawn.
+        """
+        logging.debug("Populating listbox in PokedexView")
         if pokemon_list is None:
             pokemon_list = self.pokemon_list
-
-        for pokemon in pokemon_list:
-            pokemon_text = f"{pokemon[0]:>3} - {pokemon[1]:<12} {'★' if pokemon[13] else ''}"
-            self.pokemon_listbox.insert(tk.END, pokemon_text)
+        self.pokemon_listbox.set_rows(pokemon_list)
 
         self.update_result_count()
 
+    def format_pokemon_row(self, pokemon):
+        return f"{pokemon.id:>3} - {pokemon.name:<12} {'★' if pokemon.is_favorite else ''}"
+
+    def pokemon_icon(self, pokemon):
+        """Returns the list icon of a Pokémon from the sprite atlas (via the image cache), or None."""
+        return images.get_photo(
+            ("icon", pokemon.id), config.SPRITE_ICON_SIZE,
+            loader=lambda: self.data_manager.get_icon(pokemon.id),
+        )
+
     def filter_pokemon_list(self):
-        """Filters the Pokemon list based on the search term and updates the Listbox."""
-        search_term = self.search_term.get().lower()
+        """Filters the Pokemon list based on the search term and updates the Listbox.
+
+        Plain text is a ranked search. Queries with type:/stat terms (e.g.
+        "type:fire speed>=100") are run in the database and paged into the
+        lazy-loaded list.
+        """
+        search_term = self.search_term.get().strip()
+        filters = parse_filter_query(search_term)
         self.filtered_pokemon = []
+        if set(filters) - {"search"}:
+            self.search_active = False
+            self.apply_filters(filters)
+            return
+        if self.filters:
+            self.apply_filters(None)
         if search_term:
             self.search_active = True
-            for pokemon in self.pokemon_list:
-                # Check if the search term matches either the name or type
-                if (
-                        search_term in pokemon[1].lower()
-                        or (pokemon[2] and search_term in pokemon[2].lower())
-                        or (pokemon[3] and search_term in pokemon[3].lower())
-                ):
-                    self.filtered_pokemon.append(pokemon)
+            # Searches name, type and description across the whole Pokédex, not just loaded batches
+            self.filtered_pokemon = self.data_manager.search_pokemon(search_term, list_rows=True)
         else:
             self.search_active = False
 
@@ -123,10 +165,24 @@ class PokedexView(tk.Frame):
             self.filtered_pokemon if self.search_active else None
         )
 
+    def apply_filters(self, filters):
+        """Restarts the lazy-loaded list with the given filters (None for the whole Pokédex)."""
+        if filters == self.filters:
+            return
+        self.filters = filters
+        self.filter_count = self.data_manager.count_pokemon(filters) if filters else 0
+        self.pokemon_list = []
+        self.next_cursor = None
+        self.all_loaded = False
+        self.selected_index = 0
+        self.populate_listbox()
+        self.load_pokemon_batch()
+
     def clear_search(self):
         """Clears the search bar and resets the Pokemon list."""
         self.search_term.set("")
         self.search_active = False
+        self.apply_filters(None)
         self.populate_listbox()
 
     def on_search_enter(self, event=None):
@@ -150,6 +206,7 @@ class PokedexView(tk.Frame):
                 self.pokemon_listbox.yview()[1] > 0.9
                 and not self.search_active
                 and not self.loading_more
+                and not self.all_loaded
         ):
             self.load_pokemon_batch()
 
@@ -222,12 +279,22 @@ class PokedexView(tk.Frame):
         if 0 <= self.selected_index < self.pokemon_listbox.size():
             self.pokemon_listbox.selection_set(self.selected_index)
             self.pokemon_listbox.see(self.selected_index)
+            self.prefetch_neighbours()
+
+    def prefetch_neighbours(self):
+        """Asks the prefetcher to warm the selected Pokémon and its neighbours, nearest first."""
+        rows = self.filtered_pokemon if self.search_active else self.pokemon_list
+        indexes = [self.selected_index]
+        for distance in range(1, config.PREFETCH_RADIUS + 1):
+            indexes += [self.selected_index + distance, self.selected_index - distance]
+        self.app.prefetcher.request([rows[i].id for i in indexes if 0 <= i < len(rows)])
 
     def on_pokemon_select(self, event):
         """Handles the <<ListboxSelect>> event."""
         logging.debug("Handling listbox selection event in PokedexView")
         if self.pokemon_listbox.curselection():
             self.selected_index = self.pokemon_listbox.curselection()[0]
+            self.prefetch_neighbours()
 
     def toggle_favorite(self, event=None):
         """Toggles the favorite status of the selected Pokemon."""
@@ -236,19 +303,33 @@ class PokedexView(tk.Frame):
             selected_index = self.pokemon_listbox.curselection()[0]
             pokemon_id = self.get_selected_pokemon_id()
 
-            is_favorite = not self.get_selected_pokemon()[13]
-            self.data_manager.update_favorite_status(pokemon_id, is_favorite)
+            is_favorite = not self.get_selected_pokemon().is_favorite
+            updated = self.data_manager.update_favorite_status(pokemon_id, is_favorite)
+            if updated is not None:
+                self.patch_pokemon_row(updated, selected_index)
 
-            # Reload Pokemon list from the database
-            if self.search_active:
-                self.filter_pokemon_list()  # Reload filtered list
-            else:
-                self.pokemon_list = self.data_manager.get_all_pokemon()  # Reload full list
-                self.populate_listbox()
+    def patch_pokemon_row(self, updated, shown_index=None):
+        """Replaces the row of ``updated.id`` with ``updated`` and redraws it; the lazy-loading state is kept.
 
-            # Restore the selection
-            self.selected_index = selected_index
-            self.update_selection()
+        Also called by DetailView after a favourite changes there. ``shown_index``
+        is the row's index in the list on screen, when the caller knows it.
+        """
+        # The loaded list is in id order, so the row is found by bisection (it may be hidden by a search)
+        index = index_by_id(self.pokemon_list, updated.id)
+        if index is not None:
+            self.pokemon_list[index] = updated
+        if self.search_active:
+            if shown_index is None:
+                # Search results are ranked, not in id order
+                shown_index = next(
+                    (i for i, pokemon in enumerate(self.filtered_pokemon) if pokemon.id == updated.id), None
+                )
+            if shown_index is not None:
+                self.filtered_pokemon[shown_index] = updated
+        elif shown_index is None:
+            shown_index = index
+        if shown_index is not None:
+            self.pokemon_listbox.refresh_row(shown_index)
 
     def get_selected_pokemon(self):
         """Gets the currently selected Pokemon data."""
@@ -259,12 +340,12 @@ class PokedexView(tk.Frame):
 
     def get_selected_pokemon_id(self):
         """Gets the ID of the currently selected Pokemon."""
-        return self.get_selected_pokemon()[0]
+        return self.get_selected_pokemon().id
 
     def update_result_count(self):
         """Updates the label with the number of search results."""
-        if self.search_active:
-            count = len(self.filtered_pokemon)
+        if self.search_active or self.filters:
+            count = len(self.filtered_pokemon) if self.search_active else self.filter_count
             self.result_count_label.config(
                 text=f"Found {count} Pokémon"
             )
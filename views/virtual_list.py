@@ -0,0 +1,184 @@
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+
+
+class VirtualList(tk.Frame):
+    """Single-selection list that only draws the rows in view.
+
+    Rows come from a backing sequence set with set_rows. ``format_row(row)``
+    gives the text of a row and ``icon_for(row)`` an optional PhotoImage drawn
+    before it. Only as many canvas items as fit on screen exist; scrolling,
+    jumping and replacing the rows just re-draw that window, so they cost
+    O(visible rows) whatever the number of rows.
+
+    The methods PokedexView uses on a tk.Listbox are provided with the same
+    meaning: size, curselection, selection_set, selection_clear, see, yview,
+    focus_set and bind (which also receives <<ListboxSelect>>).
+    """
+
+    def __init__(self, master, format_row=str, icon_for=None, icon_size=None, width=20,
+                 background="white", foreground="black", select_background="#3875d7",
+                 select_foreground="white", **kwargs):
+        super().__init__(master, **kwargs)
+        self.format_row = format_row
+        self.icon_for = icon_for
+        self.colors = (background, foreground, select_background, select_foreground)
+        self.font = tkfont.nametofont("TkDefaultFont")
+        self.icon_width = icon_size[0] if icon_for and icon_size else 0
+        self.row_height = max(self.font.metrics("linespace"), icon_size[1] if self.icon_width else 0) + 4
+
+        self.rows = []
+        self.top = 0  # Index of the first row in view
+        self.selected = None
+        self._row_items = []  # (background, icon, text) canvas items, one per row slot on screen
+        self._row_icons = []  # The PhotoImage shown in each slot, kept referenced while it is drawn
+
+        self.canvas = tk.Canvas(
+            self, background=background, highlightthickness=1, takefocus=1,
+            width=self.icon_width + width * self.font.measure("0") + 8, height=self.row_height * 10,
+        )
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self._render())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll(1))
+
+    # --- Data ---
+
+    def set_rows(self, rows):
+        """Replaces the backing rows; the view keeps its position where possible."""
+        self.rows = rows
+        if self.selected is not None and self.selected >= len(rows):
+            self.selected = None
+        self.top = max(0, min(self.top, len(rows) - self.visible_count()))
+        self._render()
+
+    def refresh_row(self, index):
+        """Re-draws one row after its data changed; a no-op when it is out of view."""
+        slot = index - self.top
+        if 0 <= slot < len(self._row_items) and index < len(self.rows):
+            self._render_slot(slot)
+
+    # --- tk.Listbox compatible interface ---
+
+    def size(self):
+        return len(self.rows)
+
+    def curselection(self):
+        return (self.selected,) if self.selected is not None else ()
+
+    def selection_set(self, index):
+        if 0 <= index < len(self.rows):
+            self.selected = index
+            self._render()
+
+    def selection_clear(self, first=0, last=None):
+        if self.selected is not None:
+            self.selected = None
+            self._render()
+
+    def see(self, index):
+        """Scrolls so that row ``index`` is in view."""
+        visible = self.visible_count()
+        if index < self.top:
+            self._scroll_to(index)
+        elif index >= self.top + visible:
+            self._scroll_to(index - visible + 1)
+
+    def yview(self, *args):
+        """Returns the (first, last) fractions in view, like Listbox.yview(); with arguments, scrolls."""
+        if args:
+            self._on_scrollbar(*args)
+            return None
+        total = len(self.rows)
+        if not total:
+            return 0.0, 1.0
+        return self.top / total, min(1.0, (self.top + self.visible_count()) / total)
+
+    def focus_set(self):
+        self.canvas.focus_set()
+
+    def focus_get(self):
+        return self.canvas.focus_get()
+
+    def bind(self, sequence=None, func=None, add=None):
+        return self.canvas.bind(sequence, func, add)
+
+    # --- Scrolling ---
+
+    def visible_count(self):
+        height = self.canvas.winfo_height()
+        if height <= 1:  # Not mapped yet
+            height = int(self.canvas.cget("height"))
+        return max(1, height // self.row_height)
+
+    def scroll(self, rows):
+        self._scroll_to(self.top + rows)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self.rows) - self.visible_count()))
+        if top != self.top:
+            self.top = top
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.rows)))
+        elif action == "scroll":
+            step = self.visible_count() if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        index = self.top + int(self.canvas.canvasy(event.y) // self.row_height)
+        if 0 <= index < len(self.rows):
+            self.selected = index
+            self._render()
+            self.canvas.event_generate("<<ListboxSelect>>")
+
+    # --- Drawing ---
+
+    def _render(self):
+        """Draws the rows in view, reusing one set of canvas items per on-screen slot."""
+        width = self.canvas.winfo_width()
+        slots = self.visible_count() + 1  # A partly visible row at the bottom
+        while len(self._row_items) < slots:
+            y = len(self._row_items) * self.row_height
+            self._row_items.append((
+                self.canvas.create_rectangle(0, y, width, y + self.row_height, width=0),
+                self.canvas.create_image(2, y + self.row_height // 2, anchor="w"),
+                self.canvas.create_text(self.icon_width + 6, y + self.row_height // 2, anchor="w", font=self.font),
+            ))
+            self._row_icons.append(None)
+
+        for slot, (rect, icon, text) in enumerate(self._row_items):
+            if slot >= slots or self.top + slot >= len(self.rows):
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.itemconfigure(icon, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+            else:
+                self._render_slot(slot, width)
+
+        first, last = self.yview()
+        self.scrollbar.set(first, last)
+
+    def _render_slot(self, slot, width=None):
+        """Draws the row that is in view at ``slot``."""
+        background, foreground, select_background, select_foreground = self.colors
+        rect, icon, text = self._row_items[slot]
+        index = self.top + slot
+        row = self.rows[index]
+        selected = index == self.selected
+        y = slot * self.row_height
+        self.canvas.coords(rect, 0, y, width or self.canvas.winfo_width(), y + self.row_height)
+        self.canvas.itemconfigure(rect, state="normal", fill=select_background if selected else background)
+        photo = self.icon_for(row) if self.icon_for else None
+        self._row_icons[slot] = photo
+        self.canvas.itemconfigure(icon, state="normal" if photo else "hidden", image=photo or "")
+        self.canvas.itemconfigure(text, state="normal", text=self.format_row(row),
+                                  fill=select_foreground if selected else foreground)